@@ -0,0 +1,89 @@
+"""
+SayraEar transcription real-time-factor benchmark.
+
+RTF = decode time / audio duration (lower is better; < 1 = faster than real time).
+Compares the legacy temp-file path (beam 5, no VAD) against in-memory float32
+audio across beam size / VAD / language settings.
+
+Run from SAYRA/ with one or more recorded commands (any sample rate, mono or stereo WAV):
+    python -m benchmarks.ear_rtf --wav samples/open_chrome.wav samples/play_believer.wav
+    python -m benchmarks.ear_rtf --wav cmd.wav --model small --repeats 5
+"""
+import argparse
+import itertools
+import os
+import tempfile
+import time
+import wave
+import numpy as np
+import yaml
+from faster_whisper import WhisperModel
+from modules.hear.transcriber import SAMPLE_RATE, Transcriber, pcm_to_float32, resample, transcribe_options
+
+def load_wav(path):
+    """WAV -> 16 kHz mono float32 (mic path jaisa hi input)."""
+    with wave.open(path, "rb") as f:
+        rate, channels, width = f.getframerate(), f.getnchannels(), f.getsampwidth()
+        raw = f.readframes(f.getnframes())
+    if width != 2:
+        raise ValueError(f"{path}: only 16-bit PCM supported")
+    samples = pcm_to_float32(raw).reshape(-1, channels).mean(axis=1)
+    return resample(samples, rate)
+
+def legacy_transcribe(model, samples):
+    """Purana path: temp WAV likho, model file se decode kare, segments loop mein jodo."""
+    path = os.path.join(tempfile.gettempdir(), "temp_command.wav")
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes((samples * 32767).astype(np.int16).tobytes())
+    segments, info = model.transcribe(path, beam_size=5)
+    text = ""
+    for segment in segments:
+        text += segment.text
+    os.remove(path)
+    return text.strip()
+
+def measure(fn, clips, repeats):
+    rtfs, text = [], ""
+    for samples in clips:
+        duration = len(samples) / SAMPLE_RATE
+        for _ in range(repeats):
+            start = time.perf_counter()
+            text = fn(samples)
+            rtfs.append((time.perf_counter() - start) / duration)
+    return np.median(rtfs), np.percentile(rtfs, 95), text
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--wav", nargs="+", required=True)
+    parser.add_argument("--model", default=None, help="Default: hearing.model_size")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    with open("config/settings.yaml", "r", encoding="utf-8") as f:
+        hearing = yaml.safe_load(f)['hearing']
+    model = WhisperModel(args.model or hearing['model_size'], device=hearing.get('device', 'cpu'),
+                         compute_type=hearing.get('compute_type', 'int8'))
+    clips = [load_wav(p) for p in args.wav]
+    options = transcribe_options(hearing)
+    transcriber = Transcriber(model, options)
+    print(f"{len(clips)} clip(s), {sum(len(c) for c in clips) / SAMPLE_RATE:.1f}s audio, "
+          f"model {args.model or hearing['model_size']}, configured {options}")
+
+    # Warm-up (pehli call mein model init ka kharcha)
+    transcriber.transcribe(clips[0])
+
+    def row(name, fn):
+        p50, p95, text = measure(fn, clips, args.repeats)
+        print(f"  {name:<36} RTF p50 {p50:.3f}  p95 {p95:.3f}  -> {text[:50]!r}")
+
+    row("legacy temp file, beam 5", lambda s: legacy_transcribe(model, s))
+    row("configured (settings.yaml)", transcriber.transcribe)
+    for beam, vad, language in itertools.product((1, 5), (False, True), (None, "en")):
+        name = f"in-memory beam {beam}, vad {'on' if vad else 'off'}, lang {language or 'auto'}"
+        row(name, lambda s: transcriber.transcribe(s, beam_size=beam, vad_filter=vad, language=language))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+File target resolution check (grammar -> resolve_patterns).
+
+A named file or glob must never widen into a category wildcard, and a generic
+target ("all files") must not become a literal pattern that silently matches nothing.
+
+Run from SAYRA/:
+    python -m benchmarks.file_targets
+"""
+from modules.automation.file_engine import TARGET_PATTERNS, resolve_patterns
+from modules.brain.grammar import grammar
+
+# (command, expected patterns; None = grammar should not parse it as FILE_OPERATION)
+CASES = [
+    ("delete wallpaper_image.png from downloads", ["wallpaper_image.png"]),
+    ("delete football_photo.jpg", ["football_photo.jpg"]),
+    ("move small_video_notes.txt to documents", ["small_video_notes.txt"]),
+    ("delete install_songs.txt", ["install_songs.txt"]),
+    ("delete *.tmp from downloads", ["*.tmp"]),
+    ("move all pdfs to documents", TARGET_PATTERNS['pdf']),
+    ("delete the text files from downloads", TARGET_PATTERNS['text']),
+    ("copy my photos to desktop", TARGET_PATTERNS['photo']),
+    ("move every video to videos", TARGET_PATTERNS['video']),
+    ("delete all files from downloads", None),
+    ("copy that", None),
+    ("move on", None),
+]
+
+# Direct resolve_patterns inputs (LLM planner bhi target de sakta hai)
+DIRECT = [
+    ("small_video_notes", ["small_video_notes"]),
+    ("all files", []),
+    ("my files", []),
+    ("images", TARGET_PATTERNS['image']),
+]
+
+def main():
+    failures = 0
+    for command, expected in CASES:
+        tasks = grammar.parse(command)
+        task = tasks[0] if tasks else None
+        if task is None or task['intent'] != 'FILE_OPERATION':
+            got = None
+        else:
+            got = resolve_patterns(task['entities']['target'])
+        ok = got == expected
+        failures += not ok
+        print(f"  {'ok  ' if ok else 'FAIL'} {command!r:<48} -> {got}")
+
+    for target, expected in DIRECT:
+        got = resolve_patterns(target)
+        ok = got == expected
+        failures += not ok
+        label = f"resolve_patterns({target!r})"
+        print(f"  {'ok  ' if ok else 'FAIL'} {label:<48} -> {got}")
+
+    print(f"{failures} failure(s)")
+    raise SystemExit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Hot-set (NumPy) vs pure Chroma recall benchmark.
+
+Synthetic clustered 384-d embeddings (MiniLM size) so no model download is needed.
+Ground truth = exact brute-force cosine top-k over the full collection.
+"relevant" recall only counts true neighbours at/above --threshold (plus the true top-1):
+the hot set deliberately drops weak neighbours below it.
+
+Run from SAYRA/:
+    python -m benchmarks.memory_hotset
+    python -m benchmarks.memory_hotset --sizes 1000 10000 --queries 300 --k 2
+"""
+import argparse
+import time
+import uuid
+import chromadb
+import numpy as np
+from modules.brain.hot_index import HotSetIndex
+
+DIM = 384
+
+def make_corpus(n, rng, clusters=200):
+    centers = rng.standard_normal((clusters, DIM)).astype(np.float32)
+    labels = rng.integers(0, clusters, n)
+    vectors = centers[labels] + 0.6 * rng.standard_normal((n, DIM)).astype(np.float32)
+    return HotSetIndex.normalize(vectors)
+
+def make_queries(corpus, count, rng, recent_window, recent_bias):
+    # Zyada tar sawal recent baaton ke baare mein hote hain
+    n = len(corpus)
+    recent = rng.random(count) < recent_bias
+    picks = np.where(recent, rng.integers(max(0, n - recent_window), n, count), rng.integers(0, n, count))
+    # Noise norm ~0.25 (unit vectors) = paraphrased question
+    queries = corpus[picks] + (0.25 / np.sqrt(DIM)) * rng.standard_normal((count, DIM)).astype(np.float32)
+    return HotSetIndex.normalize(queries)
+
+def exact_topk(corpus, queries, k, threshold):
+    scores = queries @ corpus.T
+    truth, relevant = [], []
+    for row in scores:
+        top = np.argsort(-row)[:k]
+        truth.append(set(top))
+        relevant.append({top[0]} | {i for i in top if row[i] >= threshold})
+    return truth, relevant
+
+def recall_at_k(found, truth):
+    return np.mean([len(f & t) / len(t) for f, t in zip(found, truth)])
+
+def precision(found, relevant):
+    return np.mean([len(f & r) / len(f) for f, r in zip(found, relevant)])
+
+def run_size(n, args, rng):
+    corpus = make_corpus(n, rng)
+    ids = [str(uuid.uuid4()) for _ in range(n)]
+    index_of = {mem_id: i for i, mem_id in enumerate(ids)}
+    queries = make_queries(corpus, args.queries, rng, args.hot_size, args.recent_bias)
+    truth, relevant = exact_topk(corpus, queries, args.k, args.threshold)
+
+    # --- Pure Chroma (HNSW) ---
+    client = chromadb.EphemeralClient()
+    collection = client.create_collection(f"bench_{n}_{uuid.uuid4().hex[:6]}", metadata={"hnsw:space": "cosine"})
+    start = time.perf_counter()
+    for i in range(0, n, 5000):
+        collection.add(ids=ids[i:i + 5000], embeddings=corpus[i:i + 5000].tolist(),
+                       documents=[f"memory {j}" for j in range(i, min(i + 5000, n))])
+    build_s = time.perf_counter() - start
+
+    chroma_found, chroma_ms = [], []
+    for q in queries:
+        t = time.perf_counter()
+        res = collection.query(query_embeddings=[q.tolist()], n_results=args.k)
+        chroma_ms.append((time.perf_counter() - t) * 1000)
+        chroma_found.append({index_of[i] for i in res['ids'][0]})
+
+    # --- Hot set (recent window) + Chroma fallback, as SayraMemory.recall does ---
+    hot = HotSetIndex(capacity=min(args.hot_size, n))
+    recent = slice(max(0, n - args.hot_size), n)
+    hot.add(ids[recent], [""] * len(ids[recent]), corpus[recent])
+
+    hybrid_found, hybrid_ms, hot_hits = [], [], 0
+    for q in queries:
+        t = time.perf_counter()
+        hits = HotSetIndex.confident(hot.search(q, args.k), args.threshold)
+        if hits:
+            hot_hits += 1
+            found = {index_of[mem_id] for mem_id, _, _ in hits}
+        else:
+            res = collection.query(query_embeddings=[q.tolist()], n_results=args.k)
+            found = {index_of[i] for i in res['ids'][0]}
+        hybrid_ms.append((time.perf_counter() - t) * 1000)
+        hybrid_found.append(found)
+
+    # --- Full NumPy matrix (upper bound: everything hot) ---
+    full = HotSetIndex(capacity=n)
+    full.add(ids, [""] * n, corpus)
+    full_found, full_ms = [], []
+    for q in queries:
+        t = time.perf_counter()
+        hits = full.search(q, args.k)
+        full_ms.append((time.perf_counter() - t) * 1000)
+        full_found.append({index_of[mem_id] for mem_id, _, _ in hits})
+
+    def row(name, ms, found, extra=""):
+        print(f"  {name:<22} p50 {np.percentile(ms, 50):7.3f} ms  p95 {np.percentile(ms, 95):7.3f} ms  "
+              f"recall@{args.k} {recall_at_k(found, truth):.3f}  relevant {recall_at_k(found, relevant):.3f}  "
+              f"precision {precision(found, relevant):.3f}{extra}")
+
+    print(f"\n[{n:,} memories]  (chroma build {build_s:.1f}s)")
+    row("chroma (hnsw)", chroma_ms, chroma_found)
+    row(f"hot set {hot.capacity} + chroma", hybrid_ms, hybrid_found, f"  hot-hit {hot_hits / len(queries):.0%}")
+    row("numpy full matrix", full_ms, full_found)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=2)
+    parser.add_argument("--hot-size", type=int, default=2000)
+    parser.add_argument("--threshold", type=float, default=0.8)
+    parser.add_argument("--recent-bias", type=float, default=0.8, help="Fraction of queries about recent memories")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    for n in args.sizes:
+        run_size(n, args, rng)
+
+if __name__ == "__main__":
+    main()
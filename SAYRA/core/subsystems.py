@@ -0,0 +1,113 @@
+import asyncio
+import threading
+import time
+from core.event_bus import bus
+
+PROCESS_START = time.perf_counter()
+
+class LazyProxy:
+    """
+    Global instance ki jagah: pehli attribute access par hi object banta hai.
+    `ear.listen(...)` jaisa code bina badle chalta rehta hai.
+    """
+    def __init__(self, registry, name):
+        object.__setattr__(self, '_registry', registry)
+        object.__setattr__(self, '_name', name)
+
+    def __getattr__(self, attr):
+        return getattr(self._registry.get(self._name), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._registry.get(self._name), attr, value)
+
+class SubsystemRegistry:
+    """
+    Heavy subsystems (Whisper, Chroma, Porcupine, pywhatkit...) ka registry.
+    - lazy(): import time par kuch load nahi hota
+    - warm_all(): server listen karne ke baad sab parallel threads mein ban jaate hain
+    - Har subsystem ready/failed hone par SUBSYSTEM_STATUS event (UI tak jata hai)
+    - timeline(): startup mein seconds kahan gaye
+    """
+    def __init__(self):
+        self.factories = {}
+        self.instances = {}
+        self.locks = {}
+        self.status = {}     # name -> {'name', 'state', 'ms'}
+        self.events = []     # (label, start_s, end_s) process start se
+        self.lock = threading.Lock()
+
+    def lazy(self, name, factory):
+        self.factories[name] = factory
+        self.locks[name] = threading.Lock()
+        self.status[name] = {'name': name, 'state': 'pending', 'ms': None}
+        return LazyProxy(self, name)
+
+    def ready(self, name):
+        return name in self.instances
+
+    def get(self, name):
+        instance = self.instances.get(name)
+        if instance is not None:
+            return instance
+        with self.locks[name]:
+            # Dusre thread ne beech mein bana diya ho
+            if name in self.instances:
+                return self.instances[name]
+            start = time.perf_counter()
+            try:
+                instance = self.factories[name]()
+            except Exception:
+                self._finish(name, start, 'failed')
+                raise
+            self.instances[name] = instance
+            self._finish(name, start, 'ready')
+            return instance
+
+    def _finish(self, name, start, state):
+        end = time.perf_counter()
+        with self.lock:
+            self.status[name] = {'name': name, 'state': state, 'ms': round((end - start) * 1000)}
+            self.events.append((name, start - PROCESS_START, end - PROCESS_START))
+        print(f"[Startup]: {name} {state} in {end - start:.2f}s")
+
+    def mark(self, label, since=None):
+        """Timeline par ek phase record karo (e.g. 'imports', 'server_listening')."""
+        end = time.perf_counter() - PROCESS_START
+        with self.lock:
+            start = since if since is not None else (self.events[-1][2] if self.events else 0.0)
+            self.events.append((label, start, end))
+        return end
+
+    async def warm_all(self, names=None, serial=('ear', 'wake_word')):
+        """
+        Sab (ya diye gaye) subsystems parallel threads mein banao.
+        `serial` wale (mic owners: ear calibration, phir wake word stream) isi order mein
+        ek ke baad ek - dono ek saath mic na pakdein. Baaki sab unke saath parallel.
+        """
+        names = [n for n in (names or self.factories) if not self.ready(n)]
+        chain = [n for n in serial if n in names]
+
+        async def warm(name):
+            self.status[name]['state'] = 'loading'
+            await bus.emit("SUBSYSTEM_STATUS", dict(self.status[name]))
+            try:
+                await asyncio.to_thread(self.get, name)
+            except Exception as e:
+                print(f"[Startup Error]: {name}: {e}")
+            await bus.emit("SUBSYSTEM_STATUS", dict(self.status[name]))
+
+        async def warm_chain():
+            for name in chain:
+                await warm(name)
+
+        await asyncio.gather(warm_chain(), *[warm(name) for name in names if name not in chain])
+        print(self.timeline())
+
+    def timeline(self):
+        lines = ["[Startup Timeline]:"]
+        for label, start, end in sorted(self.events, key=lambda e: e[1]):
+            lines.append(f"  {label:<18} {start:6.2f}s -> {end:6.2f}s  ({end - start:5.2f}s)")
+        return "\n".join(lines)
+
+# Global Instance
+subsystems = SubsystemRegistry()
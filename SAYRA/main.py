@@ -4,9 +4,11 @@ import os
 import yaml
 from core.event_bus import bus
 from modules.brain.brain import SayraBrain
+from modules.brain.memory import memory
 from modules.watchers.retina_guard import start_retina_guard
 from modules.watchers.circadian_fixer import start_circadian_fixer
 from modules.speak.mouth import mouth
+from modules.speak.audio_output import PRIORITY_ALERT
 from modules.hear.ear import ear
 from modules.watchers.feeder import start_feeder
 from modules.watchers.eyes import start_presence_monitor
@@ -29,16 +31,17 @@ brain = SayraBrain()
 async def handle_vision_break(message):
     """Retina Guard trigger hone par ye execute hoga"""
     print(f"\n[SAYRA - PROTECTOR]: {message}")
-    await mouth.speak(message)
+    await mouth.speak(message, priority=PRIORITY_ALERT)
     
 async def handle_system_alert(message):
     """General Alerts (Battery, Sleep Warning etc)"""
-    await mouth.speak(message)
+    await mouth.speak(message, priority=PRIORITY_ALERT)
 
 async def handle_shutdown(data):
     """Axiom 5: Instant Kill Switch"""
     print(f"\n[SAYRA]: Shutdown signal received. Goodbye, Boss.")
     await mouth.speak("Shutting down systems. Goodbye Boss.")
+    await asyncio.to_thread(lambda: memory.flush())
     # Trigger the event to stop the main loop
     shutdown_event.set()
     
@@ -84,8 +87,8 @@ async def sayra_shell():
             query = processed_input.split(" ", 1)[1]
             await mouth.speak(f"Searching web for {query}")
             
-            # 2. Perform Search (Run in executor because DDG is sync)
-            search_result = await asyncio.get_event_loop().run_in_executor(None, web_searcher.search, query)
+            # 2. Perform Search (async: cache + concurrent reformulations, per-call timeout)
+            search_result = await web_searcher.search(query)
             
             if search_result:
                 print(f"\n{search_result}") # Raw data for you to see
@@ -94,7 +97,7 @@ async def sayra_shell():
                 # Hum Brain ko bolenge: "Ye data hai, ab user ke sawal ka jawab do"
                 context_prompt = f"Here is the latest data from the web:\n{search_result}\n\nUser Question: {query}\nTask: Answer the user based on this data in Hinglish. Be concise."
                 
-                response = await brain.generate_response(prompt=context_prompt, context="Web Search Mode")
+                response = await brain.generate_response(prompt=context_prompt, context="Web Search Mode", recall_query=query)
                 await mouth.speak(response)
                 
             else:
@@ -123,7 +126,7 @@ async def sayra_shell():
         # Voice Command Trigger
         elif processed_input == 'listen':
             # Ear activate karo
-            voice_text = await asyncio.get_event_loop().run_in_executor(None, ear.listen)
+            voice_text = await asyncio.get_event_loop().run_in_executor(None, lambda: ear.listen())
             
             if voice_text:
                 print(f"You said: {voice_text}")
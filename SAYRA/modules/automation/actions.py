@@ -1,18 +1,24 @@
-import pywhatkit
+import importlib
 import pyautogui
 import os
-import shutil
-import glob
 import time
 import asyncio
-from pathlib import Path
+from core.event_bus import bus
+from core.subsystems import subsystems
+from modules.automation.atmosphere import atmosphere
+from modules.automation.input_worker import input_worker, start_menu_script
+from modules.automation.file_engine import FILE_ACTIONS, file_engine, resolve_patterns
+
+PAST_TENSE = {'copy': 'Copied', 'move': 'Moved', 'delete': 'Deleted'}
+
+# pywhatkit import par hi network check karta hai -> lazy
+pywhatkit = subsystems.lazy('pywhatkit', lambda: importlib.import_module('pywhatkit'))
 
 class ActionEngine:
     def __init__(self):
-        # Safety Fail-safe: Mouse ko corner me le jaoge to script ruk jayegi
-        pyautogui.FAILSAFE = True
-        
-    # User Paths Setup (Windows)
+        # Keyboard/Screen automation input_worker thread karta hai (FAILSAFE wahin set hai)
+
+        # User Paths Setup (Windows)
         self.user_home = os.path.expanduser('~')
         self.folders = {
             "downloads": os.path.join(self.user_home, "Downloads"),
@@ -41,41 +47,58 @@ class ActionEngine:
                 song = entities.get('song')
                 if song:
                     # PyWhatKit runs blocking code, so run in executor
-                    await asyncio.to_thread(pywhatkit.playonyt, song)
+                    await asyncio.to_thread(lambda: pywhatkit.playonyt(song))
                     return f"Playing {song} on YouTube."
 
             elif intent == 'WEB_SEARCH':
                 query = entities.get('query')
                 if query:
-                    await asyncio.to_thread(pywhatkit.search, query)
+                    await asyncio.to_thread(lambda: pywhatkit.search(query))
                     return f"Searching Google for {query}."
 
             elif intent == 'OPEN_APP':
                 app = entities.get('app')
                 if app:
-                    pyautogui.press('win')
-                    time.sleep(0.5)
-                    pyautogui.write(app)
-                    time.sleep(0.5)
-                    pyautogui.press('enter')
+                    await input_worker.run(start_menu_script(app))
                     return f"Opening {app}..."
             
             elif intent == 'SYSTEM_CONTROL':
                 action = entities.get('action')
                 if action == 'volume_up':
-                    pyautogui.press('volumeup', presses=5)
+                    await input_worker.run([('press', 'volumeup', 5)])
                     return "Volume increased."
                 elif action == 'volume_down':
-                    pyautogui.press('volumedown', presses=5)
+                    await input_worker.run([('press', 'volumedown', 5)])
                     return "Volume decreased."
                 elif action == 'mute':
-                    pyautogui.press('volumemute')
+                    await input_worker.run([('press', 'volumemute')])
                     return "System muted."
                 elif action == 'screenshot':
                     timestamp = time.strftime("%Y%m%d-%H%M%S")
                     img_path = os.path.join(self.folders["pictures"], f"screenshot_{timestamp}.png")
-                    pyautogui.screenshot(img_path)
+                    await input_worker.call(pyautogui.screenshot, img_path)
                     return f"Screenshot saved to Pictures folder."
+                elif action == 'brightness':
+                    level = entities.get('level')
+                    if level is None:
+                        return "Please provide a valid brightness level."
+                    await atmosphere.set_brightness_level(int(level))
+                    return f"Brightness set to {level}%."
+                elif action == 'sentry_on':
+                    await bus.emit("ENABLE_SENTRY")
+                    return "Sentry Mode Activated."
+                elif action == 'sentry_off':
+                    await bus.emit("DISABLE_SENTRY")
+                    return "Sentry Mode Deactivated."
+                elif action == 'rest_mode':
+                    await atmosphere.activate_rest_mode()
+                    return "Rest Mode Activated 🌙"
+                elif action == 'work_mode':
+                    await atmosphere.activate_work_mode()
+                    return "Work Mode Activated 🚀"
+                elif action == 'cancel_files':
+                    count = file_engine.cancel_all()
+                    return "File operation cancelled." if count else "No file operation running."
                 
                 # --- FILE OPERATIONS ---
             elif intent == 'FILE_OPERATION':
@@ -84,36 +107,35 @@ class ActionEngine:
                 source = entities.get('source', 'downloads') # default to downloads
                 dest = entities.get('destination', 'documents')
 
+                if action not in FILE_ACTIONS:
+                    return f"I can only move, copy or delete files, not '{action}'."
+
                 src_path = self._resolve_path(source)
                 dst_path = self._resolve_path(dest)
                 
                 # Pattern Matching (e.g., "*.pdf" or "report.docx")
                 # Agar user bole "all pdfs", to hum "*.pdf" bana denge logic se
-                if "all" in target and "pdf" in target: search_pattern = "*.pdf"
-                elif "all" in target and "image" in target: search_pattern = "*.jpg" # Simple assumption
-                elif "all" in target and "text" in target: search_pattern = "*.txt"
-                else: search_pattern = target
-
-                files_found = glob.glob(os.path.join(src_path, search_pattern))
+                patterns = resolve_patterns(target)
+                if not patterns:
+                    return f"Which files should I {action}? Tell me a type (e.g. all pdfs) or a file name."
+                files_found = await asyncio.to_thread(file_engine.scan, src_path, patterns)
                 
                 if not files_found:
                     return f"No files matching '{target}' found in {source}."
 
-                count = 0
-                for file in files_found:
-                    try:
-                        file_name = os.path.basename(file)
-                        if action == 'move':
-                            shutil.move(file, os.path.join(dst_path, file_name))
-                        elif action == 'copy':
-                            shutil.copy(file, os.path.join(dst_path, file_name))
-                        elif action == 'delete':
-                            os.remove(file)
-                        count += 1
-                    except Exception as e:
-                        print(f"File Error: {e}")
-
-                return f"Successfully {action}d {count} files from {source} to {dest}."
+                dry_run = bool(entities.get('dry_run'))
+                summary = await file_engine.run(action, files_found, dst_path, dry_run=dry_run)
+                size_mb = summary['bytes'] / (1024 * 1024)
+
+                if dry_run:
+                    return f"Dry run: would {action} {summary['done']} files ({size_mb:.1f} MB) from {source} to {dest}."
+                if summary['cancelled']:
+                    return f"Cancelled. {PAST_TENSE[action]} {summary['done']} of {summary['total']} files."
+
+                msg = f"Successfully {PAST_TENSE[action].lower()} {summary['done']} files from {source} to {dest}."
+                if summary['failed']:
+                    msg += f" {summary['failed']} failed."
+                return msg
 
             return "Action executed successfully."
 
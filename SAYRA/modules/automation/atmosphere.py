@@ -1,8 +1,8 @@
 import screen_brightness_control as sbc
 import webbrowser
-import pyautogui
 import asyncio
 from modules.speak.mouth import mouth
+from modules.automation.input_worker import input_worker
 
 class Atmosphere:
     def __init__(self):
@@ -27,10 +27,12 @@ class Atmosphere:
         # Wait for browser to open then Minimize
         await asyncio.sleep(3) 
         # Win+Down minimizes active window
-        pyautogui.hotkey('win', 'down')
         # Do it twice to ensure full minimization if it wasn't maximized
-        await asyncio.sleep(0.2)
-        pyautogui.hotkey('win', 'down')
+        await input_worker.run([
+            ('hotkey', 'win', 'down'),
+            ('sleep', 0.2),
+            ('hotkey', 'win', 'down'),
+        ])
 
     async def activate_work_mode(self):
         await mouth.speak("Back to work. Focus settings applied.")
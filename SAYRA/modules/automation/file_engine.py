@@ -0,0 +1,202 @@
+import asyncio
+import fnmatch
+import itertools
+import os
+import re
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from core.event_bus import bus
+
+# "all pdfs", "all videos" jaise phrases -> glob patterns
+TARGET_PATTERNS = {
+    'pdf': ["*.pdf"],
+    'image': ["*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp"],
+    'photo': ["*.jpg", "*.jpeg", "*.png", "*.heic"],
+    'video': ["*.mp4", "*.mkv", "*.avi", "*.mov", "*.webm"],
+    'music': ["*.mp3", "*.wav", "*.flac", "*.m4a"],
+    'song': ["*.mp3", "*.wav", "*.flac", "*.m4a"],
+    'text': ["*.txt"],
+    'doc': ["*.doc", "*.docx", "*.odt"],
+    'zip': ["*.zip", "*.rar", "*.7z"],
+}
+
+# "all files", "my files" - koi type nahi bataya (bulk wildcard delete ka risk)
+GENERIC_TARGETS = {'file', 'files', 'everything', 'sab'}
+TARGET_FILLERS = {'all', 'every', 'the', 'my'}
+
+CHUNK_SIZE = 1024 * 1024  # 1 MB
+
+FILE_ACTIONS = ('move', 'copy', 'delete')
+
+class FileJobCancelled(Exception):
+    pass
+
+def resolve_patterns(target):
+    """
+    User ka target (e.g. 'all videos', '*.pdf', 'report.docx') -> patterns list.
+    Naam/glob ('.' ya '*') hamesha literal rehta hai - kabhi category mein nahi badalta
+    ('wallpaper_image.png' sirf wahi file hai, saari images nahi).
+    Generic target ('all files') -> [] (type batana padega).
+    """
+    target = (target or "").lower().strip()
+    if not target:
+        return []
+    if '.' in target or '*' in target:
+        return [target]
+
+    # Category sirf poore word par: 'videos', 'text files' (par 'small_video_notes' nahi)
+    words = [w for w in re.split(r"\s+", target) if w not in TARGET_FILLERS]
+    for word in words:
+        key = word[:-1] if word.endswith('s') and word[:-1] in TARGET_PATTERNS else word
+        if key in TARGET_PATTERNS:
+            return TARGET_PATTERNS[key]
+    if all(w in GENERIC_TARGETS for w in words):
+        return []
+    return [target]
+
+class BulkFileEngine:
+    """
+    Bulk move/copy/delete engine.
+    - scandir se enumeration
+    - Same device par move = atomic rename (instant)
+    - Cross-device copy = thread pool mein parallel, chunked I/O (cancel har chunk par check)
+    - Har file ke baad FILE_PROGRESS event bus par
+    """
+    def __init__(self, max_workers=4):
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="SayraFiles")
+        self.job_ids = itertools.count(1)
+        self.jobs = {}   # job_id -> threading.Event (cancel flag)
+
+    def scan(self, folder, patterns):
+        """Folder ke top-level files jo kisi pattern se match karein (case-insensitive)."""
+        matches = []
+        try:
+            with os.scandir(folder) as it:
+                for entry in it:
+                    if entry.is_file(follow_symlinks=False):
+                        name = entry.name.lower()
+                        if any(fnmatch.fnmatch(name, p) for p in patterns):
+                            matches.append(entry.path)
+        except FileNotFoundError:
+            pass
+        return matches
+
+    def cancel_all(self):
+        for flag in self.jobs.values():
+            flag.set()
+        return len(self.jobs)
+
+    async def run(self, action, files, dst_dir=None, dry_run=False):
+        """
+        Returns summary: {'job', 'action', 'done', 'failed', 'bytes', 'cancelled', 'seconds'}.
+        """
+        # Anjaan action (e.g. LLM ka 'rename') chupchap copy na ban jaye
+        if action not in FILE_ACTIONS:
+            raise ValueError(f"Unsupported file action: {action}")
+        job_id = next(self.job_ids)
+        cancel = threading.Event()
+        self.jobs[job_id] = cancel
+        start = time.perf_counter()
+        summary = {'job': job_id, 'action': action, 'total': len(files), 'done': 0,
+                   'failed': 0, 'bytes': 0, 'cancelled': False, 'dry_run': dry_run}
+
+        try:
+            if dry_run:
+                summary['bytes'] = sum(await asyncio.to_thread(lambda: [os.path.getsize(f) for f in files]))
+                summary['done'] = len(files)
+                return summary
+
+            if dst_dir and action in ('move', 'copy'):
+                os.makedirs(dst_dir, exist_ok=True)
+                same_device = os.stat(dst_dir).st_dev
+            else:
+                same_device = None
+
+            loop = asyncio.get_running_loop()
+            futures = {
+                loop.run_in_executor(self.pool, self._process, action, f, dst_dir, same_device, cancel): f
+                for f in files
+            }
+
+            for future in asyncio.as_completed(futures):
+                try:
+                    file_name, size = await future
+                    summary['done'] += 1
+                    summary['bytes'] += size
+                    status = 'ok'
+                except FileJobCancelled:
+                    summary['cancelled'] = True
+                    continue
+                except Exception as e:
+                    print(f"[File Error]: {e}")
+                    summary['failed'] += 1
+                    file_name, status = str(e), 'error'
+
+                await bus.emit("FILE_PROGRESS", {
+                    'job': job_id, 'action': action, 'file': file_name, 'status': status,
+                    'done': summary['done'] + summary['failed'], 'total': len(files)
+                })
+
+            return summary
+        finally:
+            summary['seconds'] = round(time.perf_counter() - start, 2)
+            del self.jobs[job_id]
+
+    # --- Worker thread side ---
+
+    def _process(self, action, src, dst_dir, dst_device, cancel):
+        if cancel.is_set():
+            raise FileJobCancelled()
+
+        file_name = os.path.basename(src)
+        size = os.path.getsize(src)
+
+        if action == 'delete':
+            os.remove(src)
+            return file_name, size
+
+        dst = self._unique_path(os.path.join(dst_dir, file_name))
+
+        if action == 'move' and os.stat(src).st_dev == dst_device:
+            # Fast path: same drive -> sirf directory entry badlo
+            os.rename(src, dst)
+            return file_name, size
+
+        if action not in ('move', 'copy'):
+            raise ValueError(f"Unsupported file action: {action}")
+        self._chunked_copy(src, dst, cancel)
+        if action == 'move':
+            os.remove(src)
+        return file_name, size
+
+    def _chunked_copy(self, src, dst, cancel):
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                while True:
+                    if cancel.is_set():
+                        raise FileJobCancelled()
+                    chunk = fsrc.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    fdst.write(chunk)
+            shutil.copystat(src, dst)
+        except BaseException:
+            # Adhoori copy mat chhodo
+            if os.path.exists(dst):
+                os.remove(dst)
+            raise
+
+    def _unique_path(self, path):
+        """Destination par same naam ho to 'name (1).ext' bana do (overwrite nahi)."""
+        if not os.path.exists(path):
+            return path
+        base, ext = os.path.splitext(path)
+        for i in itertools.count(1):
+            candidate = f"{base} ({i}){ext}"
+            if not os.path.exists(candidate):
+                return candidate
+
+# Global Instance
+file_engine = BulkFileEngine()
@@ -0,0 +1,78 @@
+import asyncio
+import queue
+import threading
+import time
+import pyautogui
+
+def start_menu_script(app_name, interval=0.0):
+    """Win -> Type -> Enter (Start Menu se app kholna)."""
+    return [
+        ('press', 'win'),
+        ('sleep', 0.5),   # Wait for menu animation
+        ('write', app_name, interval),
+        ('sleep', 0.5),   # Wait for search results
+        ('press', 'enter'),
+    ]
+
+class InputWorker:
+    """
+    Sabhi pyautogui calls ka ek hi owner thread.
+    Scripts queue mein lagte hain aur ek-ek karke poore chalte hain,
+    isliye do commands ke keystrokes kabhi mix nahi hote aur event loop free rehta hai.
+
+    Script = list of steps:
+        ('press', key[, presses])  ('write', text[, interval])
+        ('hotkey', *keys)          ('sleep', seconds)
+    """
+    def __init__(self):
+        # Safety Fail-safe: Mouse ko corner me le jaoge to script ruk jayegi
+        pyautogui.FAILSAFE = True
+
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._worker, name="SayraInputWorker", daemon=True)
+        self.thread.start()
+
+    async def run(self, script):
+        """Keystroke script queue karo aur uske khatam hone tak wait karo."""
+        return await self._submit(lambda: self._execute(script))
+
+    async def call(self, func, *args, **kwargs):
+        """Koi bhi pyautogui function (e.g. screenshot) isi thread par chalao."""
+        return await self._submit(lambda: func(*args, **kwargs))
+
+    async def _submit(self, job):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.queue.put((job, loop, future))
+        return await future
+
+    def _execute(self, script):
+        for op, *args in script:
+            if op == 'press':
+                pyautogui.press(args[0], presses=args[1] if len(args) > 1 else 1)
+            elif op == 'write':
+                pyautogui.write(args[0], interval=args[1] if len(args) > 1 else 0.0)
+            elif op == 'hotkey':
+                pyautogui.hotkey(*args)
+            elif op == 'sleep':
+                time.sleep(args[0])
+            else:
+                raise ValueError(f"Unknown input step: {op}")
+
+    def _worker(self):
+        while True:
+            job, loop, future = self.queue.get()
+            try:
+                result = job()
+                outcome = (future.set_result, result)
+            except Exception as e:
+                print(f"[Input Error]: {e}")
+                outcome = (future.set_exception, e)
+
+            def resolve(future=future, setter=outcome[0], value=outcome[1]):
+                if not future.done():
+                    setter(value)
+            loop.call_soon_threadsafe(resolve)
+
+# Global Instance
+input_worker = InputWorker()
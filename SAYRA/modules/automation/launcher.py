@@ -1,9 +1,7 @@
 import subprocess
 import yaml
-import pyautogui
-import asyncio
-import os
 from modules.speak.mouth import mouth
+from modules.automation.input_worker import input_worker, start_menu_script
 
 class AppLauncher:
     def __init__(self):
@@ -35,14 +33,8 @@ class AppLauncher:
 
     async def fallback_search(self, app_name):
         """Simulates User action: Press Win -> Type -> Enter"""
-        # Give control back to UI
-        pyautogui.press('win')
-        await asyncio.sleep(0.5) # Wait for menu animation
-        
-        pyautogui.write(app_name, interval=0.05)
-        await asyncio.sleep(0.5) # Wait for search results
-        
-        pyautogui.press('enter')
+        # Input worker thread par chalega - event loop free, keystrokes interleave nahi honge
+        await input_worker.run(start_menu_script(app_name, interval=0.05))
 
 # Global Instance
 launcher = AppLauncher()
\ No newline at end of file
@@ -0,0 +1,88 @@
+import asyncio
+import time
+
+# Resources jo ek waqt mein sirf ek task use kar sakta hai.
+# 'gui' = keyboard/screen automation (pyautogui) aur foreground focus lene wale tasks
+# (browser) - ise kabhi parallel mat chalao.
+SYSTEM_CONTROL_RESOURCES = {
+    'volume_up': {'gui'},
+    'volume_down': {'gui'},
+    'mute': {'gui'},
+    'screenshot': {'gui'},
+    'rest_mode': {'gui', 'display'},
+    'work_mode': {'display'},
+    'brightness': {'display'},
+    'sentry_on': {'sentry'},
+    'sentry_off': {'sentry'},
+    'cancel_files': set(),
+}
+
+def task_resources(task):
+    """Task kaunse exclusive resources chhoota hai (conflict inference)."""
+    intent = task.get('intent')
+    entities = task.get('entities') or {}
+
+    if intent in ('OPEN_APP', 'MUSIC_PLAY', 'WEB_SEARCH'):
+        # MUSIC_PLAY / WEB_SEARCH browser kholte hain jo foreground focus le leta hai -
+        # saath chale to OPEN_APP ke keystrokes browser mein type ho sakte hain
+        return {'gui'}
+    if intent == 'SYSTEM_CONTROL':
+        # Unknown action = safe side, GUI serialize
+        return SYSTEM_CONTROL_RESOURCES.get(entities.get('action'), {'gui'})
+    if intent == 'FILE_OPERATION':
+        source = (entities.get('source') or 'downloads').lower()
+        destination = (entities.get('destination') or 'documents').lower()
+        return {f"folder:{source}", f"folder:{destination}"}
+    # Baaki (e.g. CHAT) koi exclusive resource nahi chhoote
+    return set()
+
+class TaskScheduler:
+    """
+    BATCH tasks ko dependency-aware tarike se chalata hai.
+    Jo tasks koi resource share karte hain wo user ke order mein serialize hote hain;
+    baaki sab bounded concurrency ke saath parallel.
+    """
+    def __init__(self, executor, max_workers=3, gui_settle=0.3):
+        self.executor = executor        # async (intent, entities) -> result message
+        self.max_workers = max_workers
+        self.gui_settle = gui_settle    # GUI task ke baad thoda ruko taaki windows settle ho jaye
+
+    def plan(self, tasks):
+        """deps[i] = pehle wale tasks jinke saath task i ka resource conflict hai."""
+        resources = [task_resources(t) for t in tasks]
+        deps = []
+        for i in range(len(tasks)):
+            deps.append([j for j in range(i) if resources[i] & resources[j]])
+        return deps
+
+    async def run(self, tasks, on_result):
+        """
+        Sab tasks execute karo. Har result aate hi on_result(index, task, result) call hota hai.
+        Returns results list (original order mein).
+        """
+        deps = self.plan(tasks)
+        uses_gui = ['gui' in task_resources(t) for t in tasks]
+        done = [asyncio.Event() for _ in tasks]
+        results = [None] * len(tasks)
+        semaphore = asyncio.Semaphore(self.max_workers)
+        start = time.perf_counter()
+
+        async def worker(i, task):
+            try:
+                for j in deps[i]:
+                    await done[j].wait()
+                async with semaphore:
+                    results[i] = await self.executor(task['intent'], task.get('entities', {}))
+                await on_result(i, task, results[i])
+                if uses_gui[i]:
+                    await asyncio.sleep(self.gui_settle)
+            finally:
+                done[i].set()
+
+        outcomes = await asyncio.gather(*(worker(i, t) for i, t in enumerate(tasks)), return_exceptions=True)
+        for outcome in outcomes:
+            if isinstance(outcome, Exception):
+                print(f"[Scheduler Error]: {outcome}")
+
+        print(f"[Scheduler]: {len(tasks)} tasks finished in {time.perf_counter() - start:.2f}s")
+        return results
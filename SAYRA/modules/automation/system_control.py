@@ -1,8 +1,8 @@
 import asyncio
 import ctypes
-import pyautogui
 from core.event_bus import bus
 from modules.speak.mouth import mouth
+from modules.automation.input_worker import input_worker
 
 class SystemControl:
     def __init__(self):
@@ -51,7 +51,7 @@ class SystemControl:
 
         # 2. Wake up screen
         # Hum 'space' key press karenge
-        pyautogui.press('space')  # Spacebar press to wake up
+        await input_worker.run([('press', 'space')])  # Spacebar press to wake up
 
     async def execute_lock_sequence(self):
         try:
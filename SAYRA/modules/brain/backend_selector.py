@@ -0,0 +1,98 @@
+import time
+from collections import deque
+import numpy as np
+
+class BackendSelector:
+    """
+    Adaptive local/cloud choice.
+    - Har backend ki rolling first-token latency (p50/p95) aur error rate
+    - Circuit breaker: lagatar `failure_threshold` errors/timeouts -> backend `cooldown_seconds`
+      ke liye band (phir half-open: ek waqt mein sirf ek trial call, begin()/release() se)
+    - Primary bahut slow ho jaye (p95 > slow_factor x failover p95) to failover pehle
+    """
+    def __init__(self, primary="ollama", failover="groq", window=50, failure_threshold=3,
+                 cooldown_seconds=30, slow_factor=2.0, min_samples=5):
+        self.primary = primary
+        self.failover = failover
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.slow_factor = slow_factor
+        self.min_samples = min_samples
+        self.latency = {b: deque(maxlen=window) for b in (primary, failover)}
+        self.outcomes = {b: deque(maxlen=window) for b in (primary, failover)}
+        self.failures = {b: 0 for b in (primary, failover)}
+        self.open_until = {b: 0.0 for b in (primary, failover)}
+        self.trial = {b: False for b in (primary, failover)}   # half-open trial chal raha hai
+
+    def available(self, backend):
+        """Circuit closed, ya cooldown khatam aur koi trial abhi chal nahi raha (half-open)."""
+        if self.open_until[backend] == 0.0:
+            return True
+        return time.monotonic() >= self.open_until[backend] and not self.trial[backend]
+
+    def begin(self, backend):
+        """
+        Call shuru karne se pehle. Half-open mein pehli call trial ban jati hai;
+        trial chal raha ho to False (doosri call mat bhejo). Open circuit par bhi True -
+        order() use peeche rakhta hai, dono band hon to bhi koshish to ho.
+        """
+        if self.open_until[backend] == 0.0 or time.monotonic() < self.open_until[backend]:
+            return True
+        if self.trial[backend]:
+            return False
+        self.trial[backend] = True
+        return True
+
+    def release(self, backend):
+        """Call bina result ke khatam (cancel / hedge mein haara) - trial slot khali karo."""
+        self.trial[backend] = False
+
+    def record_latency(self, backend, latency_ms):
+        """
+        Sirf latency sample (outcome/circuit nahi badalta). Hedge mein haarne wale backend
+        ka time-so-far (lower bound) - warna lagatar haarne wala kabhi sample hi nahi pata.
+        """
+        self.latency[backend].append(latency_ms)
+
+    def order(self, prefer=None):
+        """Backends jis order mein try karne hain."""
+        first = prefer or self.primary
+        second = self.failover if first == self.primary else self.primary
+        if not prefer and self.slower(first, second):
+            first, second = second, first
+        if not self.available(first) and self.available(second):
+            first, second = second, first
+        return [first, second]
+
+    def slower(self, a, b):
+        la, lb = self.latency[a], self.latency[b]
+        if len(la) < self.min_samples or len(lb) < self.min_samples:
+            return False
+        return np.percentile(la, 95) > self.slow_factor * np.percentile(lb, 95)
+
+    def record(self, backend, latency_ms=None, ok=True):
+        self.trial[backend] = False
+        self.outcomes[backend].append(ok)
+        if ok:
+            if latency_ms is not None:
+                self.latency[backend].append(latency_ms)
+            self.failures[backend] = 0
+            self.open_until[backend] = 0.0
+            return
+
+        self.failures[backend] += 1
+        if self.failures[backend] >= self.failure_threshold:
+            self.open_until[backend] = time.monotonic() + self.cooldown_seconds
+            print(f"[Selector]: {backend} circuit open for {self.cooldown_seconds}s")
+
+    def stats(self):
+        report = {}
+        for backend, samples in self.latency.items():
+            outcomes = self.outcomes[backend]
+            report[backend] = {
+                'p50_ms': round(float(np.percentile(samples, 50)), 1) if samples else None,
+                'p95_ms': round(float(np.percentile(samples, 95)), 1) if samples else None,
+                'error_rate': round(1 - sum(outcomes) / len(outcomes), 3) if outcomes else 0.0,
+                'circuit': 'closed' if self.available(backend) else 'open',
+            }
+        return report
@@ -1,12 +1,12 @@
-import ollama
-from groq import Groq
+import asyncio
+import time
 import yaml
-import os
-from dotenv import load_dotenv
 from modules.brain.memory import memory
 from modules.brain.reflex import reflex  # NEW IMPORT
-
-load_dotenv()
+from modules.brain.llm_client import llm, LLMCancelled
+from modules.brain.reflex_styles import ReflexStyleCache
+from modules.brain.context import ConversationContext
+from modules.brain.backend_selector import BackendSelector
 
 class SayraBrain:
     def __init__(self, config_path="config/settings.yaml"):
@@ -15,15 +15,55 @@ class SayraBrain:
         
         self.local_model = self.config['brain']['ollama']['model']
         self.cloud_model = self.config['brain']['groq']['model']
-        self.client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+        self.llm = llm
+        self.models = {'ollama': self.local_model, 'groq': self.cloud_model}
+
+        # Primary/failover + latency/error tracking + circuit breaker
+        sel_cfg = self.config['brain'].get('selector', {})
+        self.selector = BackendSelector(
+            primary=self.config['brain'].get('primary', 'ollama'),
+            failover=self.config['brain'].get('failover', 'groq'),
+            window=sel_cfg.get('window', 50),
+            failure_threshold=sel_cfg.get('failure_threshold', 3),
+            cooldown_seconds=sel_cfg.get('cooldown_seconds', 30),
+            slow_factor=sel_cfg.get('slow_factor', 2.0),
+            min_samples=sel_cfg.get('min_samples', 5)
+        )
+        # privacy_level maximum: prompt + memories kabhi cloud (groq) ko nahi -
+        # na failover, na hedging. Local fail ho to local ka error hi dikhao.
+        self.local_only = self.config.get('system', {}).get('privacy_level') == 'maximum'
+
+        # Hedging: local se token na aaye to deadline ke baad dusra backend bhi chalao
+        self.hedge = sel_cfg.get('hedge', False) and not self.local_only
+        self.hedge_after = sel_cfg.get('hedge_after_ms', 1200) / 1000
 
-    async def generate_response(self, prompt, context=""):
+        # Precomputed styled reflex answers (per fact + model)
+        self.reflex_styles = ReflexStyleCache(
+            variants=self.config['brain'].get('reflex_variants', 3)
+        )
+
+        # Token-budgeted prompt builder + short-term dialogue history
+        ctx_cfg = self.config['brain'].get('context', {})
+        self.context = ConversationContext(
+            max_tokens=ctx_cfg.get('max_tokens', 2048),
+            memory_tokens=ctx_cfg.get('memory_tokens', 512),
+            reply_tokens=ctx_cfg.get('reply_tokens', 512),
+            max_turns=ctx_cfg.get('history_turns', 12)
+        )
+
+    async def generate_response(self, prompt, context="", recall_query=None, session="default",
+                                memories=None, skip_reflex=False, commit=True):
         """
         Hybrid Flow: Reflex -> Memory -> LLM
+        recall_query: memory search ke liye chhota query (default = prompt).
+        Web search jaise flows mein prompt bahut bada hota hai, use embed karna waste hai.
+        session: dialogue history ka key (follow-up sawal).
+        memories / skip_reflex: turn orchestrator ne recall/reflex pehle hi kar liya ho to.
+        commit: history/memory save (speculative generation ke liye callable, dekho remember()).
         """
         
         # --- LAYER 1: REFLEX SYSTEM (The Truth) ---
-        reflex_data = reflex.check_reflex(prompt)
+        reflex_data = None if skip_reflex else reflex.check_reflex(prompt)
         
         if reflex_data:
             # Reflex match gaya! Ab LLM se bas is fact ko 'Hinglish' mein convert karwayenge.
@@ -34,25 +74,66 @@ class SayraBrain:
         # --- LAYER 2: DEEP THINKING (The Logic) ---
         # Agar reflex nahi hai, to purana process follow karo
         
-        # 1. Recall
-        past_memories = memory.recall(prompt)
+        # 1. Recall (embedding + DB lookup thread mein, loop free)
+        past_memories = memories if memories is not None else \
+            await asyncio.to_thread(lambda: memory.recall(recall_query or prompt))
         
-        # 2. Select Model & Query
-        if self.should_use_cloud(prompt):
-            response = await self.query_groq(prompt, past_memories, context)
-        else:
-            response = await self.query_ollama(prompt, past_memories, context)
-
-        # 3. Save Memory (Only specific non-reflex interactions)
-        if len(prompt.split()) > 2:
-            memory.save_memory(prompt, source="user")
+        # 2. Select Model & Query (selector primary/failover + circuit breaker)
+        reply = None
+        try:
+            response = reply = await self.query_model(prompt, past_memories, context, session)
+        except LLMCancelled:
+            response = ""
+        except Exception as e:
+            response = f"Thinking error: {e}"
+
+        # 3. Save History + Memory
+        await self.remember(prompt, reply, session, recall_query, commit)
         
         return response
 
+    async def remember(self, prompt, reply=None, session="default", turn=None, commit=True):
+        """
+        Dialogue history (reply mila ho to) aur long-term memory mein save.
+        commit callable ho (speculative generation) to abhi kuch nahi likhte - save coroutine
+        commit() ko de dete hain, orchestrator route CHAT confirm hone par hi chalata hai.
+        """
+        async def save():
+            if reply:
+                self.context.record(session, turn or prompt, reply)
+            # Only specific non-reflex interactions
+            if len(prompt.split()) > 2:
+                # Lazy proxy lookup bhi thread mein (Chroma load ho raha ho to loop na ruke)
+                await asyncio.to_thread(lambda: memory.save_memory(prompt, source="user"))
+
+        if callable(commit):
+            commit(save)
+        elif commit:
+            await save()
+
     async def style_fact(self, fact):
         """
-        Takes a raw fact (e.g., 'You are Dwarika') and converts it to Sayra's personality via LLM.
+        Takes a raw fact (e.g., 'You are Dwarika') and converts it to Sayra's personality.
+        Precomputed variants rotate karte hain; miss par hi LLM chalta hai.
         """
+        reflex.refresh()
+        self.reflex_styles.validate(reflex.profile, self.local_model)
+
+        styled = self.reflex_styles.get(fact)
+        if styled:
+            return styled
+
+        try:
+            styled = await self.generate_styled_fact(fact)
+        except LLMCancelled:
+            return ""
+        except:
+            return fact # Fallback to raw fact if LLM fails
+
+        self.reflex_styles.add(fact, styled)
+        return styled
+
+    async def generate_styled_fact(self, fact, cancellable=True):
         style_prompt = f"""
         You are SAYRA. 
         TASK: Rewrite the following FACT in Hinglish (Hindi+English) with respect and loyalty.
@@ -60,68 +141,190 @@ class SayraBrain:
         
         User is 'Boss'. Do not change the meaning of the fact. Just add personality.
         """
-        try:
-            # Is chote task ke liye Local Model best hai
-            res = ollama.chat(model=self.local_model, messages=[
-                {'role': 'user', 'content': style_prompt}
-            ])
-            return res['message']['content']
-        except:
-            return fact # Fallback to raw fact if LLM fails
+        # Is chote task ke liye Local Model best hai
+        return await self.llm.chat('ollama', self.local_model, [
+            {'role': 'user', 'content': style_prompt}
+        ], cancellable=cancellable)
+
+    async def warm_reflex_styles(self):
+        """
+        Background job: sabhi reflex facts ke variants pehle se bana ke rakho.
+        Server start par chalta hai, taaki reflex reply milliseconds mein aaye.
+        """
+        reflex.refresh()
+        self.reflex_styles.validate(reflex.profile, self.local_model)
+
+        for fact in reflex.facts().values():
+            attempts = self.reflex_styles.missing(fact) * 2
+            while self.reflex_styles.missing(fact) > 0 and attempts > 0:
+                attempts -= 1
+                try:
+                    # Background kaam: nayi command ka cancel_inflight() ise na roke
+                    styled = await self.generate_styled_fact(fact, cancellable=False)
+                except Exception as e:
+                    # Sirf ye fact chhodo, baaki facts ka warm-up chalta rahe
+                    print(f"[Brain]: Reflex warm-up skipped for a fact ({e!r})")
+                    break
+                self.reflex_styles.add(fact, styled)
+
+        print("[Brain]: Reflex styles ready.")
 
     def should_use_cloud(self, prompt):
+        """Heavy topics par cloud model (quality hint; latency/health selector decide karta hai)."""
         keywords = ['interview', 'architecture', 'anxiety', 'salary', 'future', 'code', 'plan', 'complex']
         return any(word in prompt.lower() for word in keywords)
 
-    async def query_ollama(self, prompt, memories, context):
-        # Dynamic Profile Load
-        profile = reflex.profile 
-        
-        system_instructions = f"""
-        ### IDENTITY (ABSOLUTE TRUTH) ###
-        Name: {profile['bot_name']}
-        Role: {profile['bot_role']}
-        User: {profile['user_name']} (Boss)
-        
-        ### INSTRUCTIONS ###
-        - Speak in {profile['language_style']}
-        - Use MEMORIES as reference data only.
-        - Be concise.
+    def backend_order(self, prompt):
+        if self.local_only:
+            return ['ollama']
+        return self.selector.order(prefer='groq' if self.should_use_cloud(prompt) else None)
+
+    def build_messages(self, backend, prompt, memories, context, session="default"):
+        # Dynamic Profile Load (prefix profile badalne par hi badlega)
+        return self.context.build(backend, reflex.profile, prompt, memories, context, session)
+
+    async def query_model(self, prompt, memories, context, session="default"):
+        """
+        Non-streaming reply. Pehla backend fail/timeout ho to failover try karo.
+        Sab fail hon to aakhri error raise (LLMCancelled bhi upar jata hai).
+        """
+        error = None
+        for backend in self.backend_order(prompt):
+            # Half-open circuit ka trial pehle se chal raha hai -> is backend ko skip
+            if not self.selector.begin(backend):
+                continue
+            start = time.perf_counter()
+            try:
+                reply = await self.llm.chat(backend, self.models[backend],
+                                            self.build_messages(backend, prompt, memories, context, session))
+            except LLMCancelled:
+                self.selector.release(backend)
+                raise
+            except Exception as e:
+                print(f"[Brain]: {backend} failed ({e!r})")
+                self.selector.record(backend, ok=False)
+                error = e
+                continue
+            self.selector.record(backend, (time.perf_counter() - start) * 1000)
+            return reply
+        raise error or RuntimeError("no backend available")
+
+    async def stream_model(self, prompt, memories, context, session="default"):
+        """
+        Streaming with failover + hedging.
+        Pehla backend start; `hedge_after` tak token na aaye (ya error aaye) to dusra bhi start,
+        jo pehle token de wahi jeetega, doosra cancel.
         """
+        backups = self.backend_order(prompt)
+        pending = {}   # first-token task -> (backend, stream, start)
+
+        def launch():
+            """Agla backend start karo (half-open trial busy ho to uske baad wala). None = koi nahi bacha."""
+            while backups:
+                backend = backups.pop(0)
+                if not self.selector.begin(backend):
+                    continue
+                stream = self.llm.stream(backend, self.models[backend],
+                                         self.build_messages(backend, prompt, memories, context, session))
+                pending[asyncio.ensure_future(stream.__anext__())] = (backend, stream, time.perf_counter())
+                return backend
+            return None
 
-        full_user_message = ""
-        if memories:
-            full_user_message += f"### MEMORIES ###\n{memories}\n\n"
-        if context:
-            full_user_message += f"### CONTEXT ###\n{context}\n\n"
-            
-        full_user_message += f"### QUERY ###\n{prompt}"
+        async def close(task, stream):
+            task.cancel()
+            try:
+                await task
+            except BaseException:
+                pass
+            await stream.aclose()
 
+        launch()
+        winner, error = None, None
         try:
-            response = ollama.chat(model=self.local_model, messages=[
-                {'role': 'system', 'content': system_instructions},
-                {'role': 'user', 'content': full_user_message}
-            ])
-            return response['message']['content']
-        except Exception as e:
-            return f"Thinking error: {e}"
+            while pending and winner is None:
+                timeout = self.hedge_after if (self.hedge and backups) else None
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    hedged = launch()
+                    if hedged:
+                        print(f"[Brain]: No token after {self.hedge_after}s, hedging with {hedged}")
+                    continue
+                for task in done:
+                    backend, stream, start = pending.pop(task)
+                    try:
+                        token = task.result()
+                    except StopAsyncIteration:
+                        token = ""
+                    except LLMCancelled:
+                        self.selector.release(backend)
+                        raise
+                    except Exception as e:
+                        print(f"[Brain]: {backend} failed ({e!r})")
+                        self.selector.record(backend, ok=False)
+                        error = e
+                        if not pending:
+                            launch()
+                        continue
+                    # Same batch mein dono ka token aaya ho to haarne wale ka bhi sample
+                    self.selector.record(backend, (time.perf_counter() - start) * 1000)
+                    if winner is None:
+                        winner = (backend, stream, token)
+                    else:
+                        await stream.aclose()
+        finally:
+            # Haarne wale branches band karo; hedge mein haara to time-so-far bhi sample
+            # (lower bound - warna lagatar haarne wala backend kabhi sample nahi pata)
+            for task, (backend, stream, start) in list(pending.items()):
+                if winner is not None:
+                    self.selector.record_latency(backend, (time.perf_counter() - start) * 1000)
+                self.selector.release(backend)
+                await close(task, stream)
 
-    async def query_groq(self, prompt, memories, context):
-        # Similar logic for cloud
-        profile = reflex.profile 
-        system_instructions = f"You are {profile['bot_name']}. User is {profile['user_name']}. Speak in Hinglish."
-        
-        user_content = f"Query: {prompt}"
-        if memories: user_content = f"Memories: {memories}\n\n{user_content}"
+        if winner is None:
+            raise error or LLMCancelled()
 
+        backend, stream, token = winner
+        if token:
+            yield token
         try:
-            chat_completion = self.client.chat.completions.create(
-                messages=[
-                    {"role": "system", "content": system_instructions},
-                    {"role": "user", "content": user_content}
-                ],
-                model=self.cloud_model,
-            )
-            return chat_completion.choices[0].message.content
+            async for token in stream:
+                yield token
+        except LLMCancelled:
+            raise
+        except Exception:
+            self.selector.record(backend, ok=False)
+            raise
+        finally:
+            await stream.aclose()
+
+    async def stream_response(self, prompt, context="", recall_query=None, session="default",
+                              memories=None, skip_reflex=False, commit=True):
+        """
+        Streaming version of generate_response.
+        Tokens ek-ek karke yield karta hai taaki UI/Speech turant shuru ho sake.
+        """
+        reflex_data = None if skip_reflex else reflex.check_reflex(prompt)
+        if reflex_data:
+            print(f"[Brain]: Reflex Triggered -> {reflex_data['type']}")
+            styled = await self.style_fact(reflex_data['fact'])
+            if styled:
+                yield styled
+            return
+
+        past_memories = memories if memories is not None else \
+            await asyncio.to_thread(lambda: memory.recall(recall_query or prompt))
+
+        reply = []
+        try:
+            async for token in self.stream_model(prompt, past_memories, context, session):
+                reply.append(token)
+                yield token
+        except LLMCancelled:
+            return
         except Exception as e:
-            return "Cloud error."
\ No newline at end of file
+            # Beech mein stream toot gaya to jo bola ja chuka hai wahi rehne do
+            if not reply:
+                yield f"Thinking error: {e}"
+                return
+
+        await self.remember(prompt, "".join(reply), session, recall_query, commit)
@@ -0,0 +1,130 @@
+import json
+import math
+from collections import deque
+
+def count_tokens(text):
+    """
+    Rough token estimate (~4 chars/token, BPE tokenizers ke aas-paas).
+    Asli tokenizer load karna har turn par mehenga hai; budget ke liye itna kaafi.
+    """
+    return math.ceil(len(text) / 4) if text else 0
+
+def trim_lines(text, budget):
+    """Best-first lines (recall output) rakho jab tak budget mein fit ho."""
+    kept, used = [], 0
+    for line in text.splitlines():
+        cost = count_tokens(line) + 1
+        if used + cost > budget:
+            break
+        kept.append(line)
+        used += cost
+    return "\n".join(kept)
+
+def trim_text(text, budget):
+    """Lamba context (web results) budget tak kaato."""
+    if count_tokens(text) <= budget:
+        return text
+    return text[:max(0, budget * 4)].rsplit(" ", 1)[0] + " ..."
+
+class ConversationContext:
+    """
+    Prompt builder with a token budget.
+    - System prefix per (backend, profile) ek baar bante hai aur byte-identical rehta hai
+      -> backend (Ollama) prompt/KV cache reuse kar sake
+    - Rolling dialogue buffer per session (follow-up sawal ke liye)
+    - Badalne wala data (memories, context) hamesha aakhri user message mein,
+      prefix ke baad, taaki prefix kabhi na toote
+    """
+    def __init__(self, max_tokens=2048, memory_tokens=512, reply_tokens=512, max_turns=12):
+        self.max_tokens = max_tokens
+        self.memory_tokens = memory_tokens
+        self.reply_tokens = reply_tokens
+        self.max_turns = max_turns
+        self.sessions = {}     # session -> deque of {'role', 'content'}
+        self.prefixes = {}     # (backend, profile signature) -> system prompt
+        self.last_stats = {}
+
+    def system_prefix(self, backend, profile):
+        key = (backend, json.dumps(profile, sort_keys=True, default=str))
+        prefix = self.prefixes.get(key)
+        if prefix is None:
+            if backend == 'groq':
+                prefix = f"You are {profile['bot_name']}. User is {profile['user_name']}. Speak in Hinglish."
+            else:
+                prefix = (
+                    "### IDENTITY (ABSOLUTE TRUTH) ###\n"
+                    f"Name: {profile['bot_name']}\n"
+                    f"Role: {profile['bot_role']}\n"
+                    f"User: {profile['user_name']} (Boss)\n\n"
+                    "### INSTRUCTIONS ###\n"
+                    f"- Speak in {profile['language_style']}\n"
+                    "- Use MEMORIES as reference data only.\n"
+                    "- Use earlier turns of this conversation for follow-up questions.\n"
+                    "- Be concise."
+                )
+            self.prefixes[key] = prefix
+        return prefix
+
+    def history(self, session):
+        return self.sessions.setdefault(session, deque())
+
+    def record(self, session, prompt, reply):
+        """Turn khatam hone par dialogue buffer mein daalo (raw text, memories ke bina)."""
+        if not reply:
+            return
+        turns = self.history(session)
+        turns.append({'role': 'user', 'content': prompt})
+        turns.append({'role': 'assistant', 'content': reply})
+        while len(turns) > self.max_turns * 2:
+            turns.popleft()
+
+    def build(self, backend, profile, prompt, memories="", context="", session="default"):
+        """
+        Returns messages list: [system prefix, ...history, user(memories + context + query)].
+        Priority: query > context > memories (memory_tokens cap) > history.
+        """
+        system = self.system_prefix(backend, profile)
+        query_block = f"### QUERY ###\n{prompt}" if backend == 'ollama' else f"Query: {prompt}"
+
+        budget = self.max_tokens - self.reply_tokens - count_tokens(system) - count_tokens(query_block)
+
+        context_block = ""
+        if context:
+            context_block = f"### CONTEXT ###\n{trim_text(context, max(0, budget - 8))}\n\n"
+            budget -= count_tokens(context_block)
+
+        memory_block = ""
+        if memories:
+            trimmed = trim_lines(memories, max(0, min(self.memory_tokens, budget) - 8))
+            if trimmed:
+                memory_block = (f"### MEMORIES ###\n{trimmed}\n\n" if backend == 'ollama'
+                                else f"Memories: {trimmed}\n\n")
+                budget -= count_tokens(memory_block)
+
+        # History: sabse nayi turns pehle fit karo (pair mein, taaki user/assistant alternate rahein)
+        turns = list(self.history(session))
+        start = len(turns)
+        used = 0
+        while start >= 2:
+            cost = count_tokens(turns[start - 2]['content']) + count_tokens(turns[start - 1]['content'])
+            if used + cost > budget:
+                break
+            used += cost
+            start -= 2
+        history = turns[start:]
+
+        user_content = memory_block + context_block + query_block
+        messages = [{'role': 'system', 'content': system}, *history, {'role': 'user', 'content': user_content}]
+
+        self.last_stats = {
+            'system': count_tokens(system),
+            'history': used,
+            'turns': len(history) // 2,
+            'memories': count_tokens(memory_block),
+            'context': count_tokens(context_block),
+            'query': count_tokens(query_block),
+        }
+        self.last_stats['total'] = sum(v for k, v in self.last_stats.items() if k != 'turns')
+        print(f"[Context]: ~{self.last_stats['total']} prompt tokens "
+              f"(history {self.last_stats['turns']} turns, memories {self.last_stats['memories']})")
+        return messages
@@ -0,0 +1,94 @@
+import re
+
+# ==========================================
+# INTENT GRAMMAR (Single declarative table)
+# ==========================================
+# File verb ke baad asli target chahiye ("copy that", "move on" files nahi hain):
+# extension/glob wala naam (report.docx, *.pdf) ya file-type noun (all pdfs, the text files).
+# Generic "all files" yahan match nahi hota -> LLM planner (bulk wildcard ka risk)
+FILE_TARGET = (r"(?P<target>(?:(?:all|every|the|my) )*(?:\S*[.*]\S*|"
+               r"(?:pdfs?|images?|photos?|videos?|music|songs?|docs?|zips?|text)(?: files?)?))")
+
+# (intent, pattern, fixed entities)
+# Pattern poore command se fullmatch hota hai; named groups = entities.
+# Upar wale rules pehle check hote hain, isliye specific rules upar rakho.
+INTENT_RULES = [
+    # --- SYSTEM CONTROL ---
+    ('SYSTEM_CONTROL', r"(?:take |le |lo )?(?:a )?screenshot(?: lo| le lo| please)?", {'action': 'screenshot'}),
+    ('SYSTEM_CONTROL', r"(?:turn |increase (?:the )?)?volume (?:up|badhao|increase)|awaaz badhao", {'action': 'volume_up'}),
+    ('SYSTEM_CONTROL', r"(?:turn |decrease (?:the )?)?volume (?:down|kam karo|decrease)|awaaz kam karo", {'action': 'volume_down'}),
+    ('SYSTEM_CONTROL', r"mute(?: (?:the )?(?:system|volume|sound))?|chup ho jao", {'action': 'mute'}),
+    ('SYSTEM_CONTROL', r"(?:set )?brightness (?:to |ko )?(?P<level>\d{1,3})(?: ?%| percent)?(?: karo| kar do)?", {'action': 'brightness'}),
+    ('SYSTEM_CONTROL', r"sentry mode on|enable security|activate sentry(?: mode)?", {'action': 'sentry_on'}),
+    ('SYSTEM_CONTROL', r"sentry mode off|disable security|deactivate sentry(?: mode)?", {'action': 'sentry_off'}),
+    ('SYSTEM_CONTROL', r"(?:activate |start )?rest mode(?: on)?", {'action': 'rest_mode'}),
+    ('SYSTEM_CONTROL', r"(?:activate |start )?(?:work|focus) mode(?: on)?", {'action': 'work_mode'}),
+    ('SYSTEM_CONTROL', r"(?:cancel|stop|ruko) (?:the )?(?:file (?:operation|transfer|copy)s?|copying|moving)", {'action': 'cancel_files'}),
+
+    # --- WEB SEARCH ---
+    # Hinglish suffix/"karo" wale pehle ("search karo" ki query "karo" na ban jaye).
+    # Bare "find" nahi - "find my keys", "find a way to relax" chat hain, search nahi.
+    ('WEB_SEARCH', r"(?P<query>.+?) (?:search karo|google karo)", {}),
+    ('WEB_SEARCH', r"(?:search|google) karo (?P<query>.+)", {}),
+    ('WEB_SEARCH', r"(?:search|google|find out|find online)(?: for)? (?!karo\b)(?P<query>.+)", {}),
+
+    # --- MUSIC ---
+    # "listen to" sirf song/gaana ke saath ("listen to me" gaana nahi hai)
+    ('MUSIC_PLAY', r"listen to (?P<song>.+?) (?:song|gaana)", {}),
+    ('MUSIC_PLAY', r"(?:play|chalao|bajaao) (?P<song>.+)", {}),
+    ('MUSIC_PLAY', r"(?P<song>.+?) (?:chalao|bajaao|play karo)", {}),
+
+    # --- APPS ---
+    ('OPEN_APP', r"(?:open|launch) (?P<app>.+)", {}),
+    ('OPEN_APP', r"(?P<app>.+?) (?:kholo|open karo|launch karo)", {}),
+
+    # --- FILES ---
+    ('FILE_OPERATION', r"(?:(?P<dry_run>dry run|preview):? )?(?P<action>move|copy|delete) " + FILE_TARGET + r"(?: from (?:the )?(?P<source>\w+)(?: folder)?)?(?: (?:to|into) (?:the )?(?P<destination>\w+)(?: folder)?)?", {}),
+]
+
+# Compound commands: "play believer and open notepad", "screenshot lo aur volume badhao"
+COMPOUND_SPLIT = r"\s*(?:,\s*)?\b(?:and then|and|aur|then|phir)\b\s*"
+
+class IntentGrammar:
+    """
+    Compiled rule table. Router ka fast path: match mila to LLM call skip.
+    """
+    def __init__(self, rules=INTENT_RULES):
+        self.rules = [(intent, re.compile(pattern), fixed) for intent, pattern, fixed in rules]
+        self.splitter = re.compile(COMPOUND_SPLIT)
+
+    def match_one(self, text):
+        """Ek single command ko task dict mein badlo, ya None."""
+        text = text.strip(" .,!?")
+        for intent, regex, fixed in self.rules:
+            m = regex.fullmatch(text)
+            if m:
+                entities = dict(fixed)
+                entities.update({k: v.strip() for k, v in m.groupdict().items() if v})
+                if 'level' in entities:
+                    # Planner prompt jaisa hi: brightness 0-100
+                    entities['level'] = max(0, min(100, int(entities['level'])))
+                return {'intent': intent, 'entities': entities}
+        return None
+
+    def parse(self, text):
+        """
+        Returns list of tasks agar poora input grammar se samajh aa gaya, warna None.
+        Compound split tabhi valid hai jab har part match ho
+        (warna "play tom and jerry" jaise song names toot jaate).
+        """
+        text = text.lower().strip()
+        if not text:
+            return None
+
+        parts = [p for p in self.splitter.split(text) if p.strip()]
+        if len(parts) > 1:
+            tasks = [self.match_one(p) for p in parts]
+            if all(tasks):
+                return tasks
+
+        task = self.match_one(text)
+        return [task] if task else None
+
+# Global Instance
+grammar = IntentGrammar()
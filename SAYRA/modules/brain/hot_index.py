@@ -0,0 +1,106 @@
+import threading
+import numpy as np
+
+class HotSetIndex:
+    """
+    In-process vector index for the "hot" memories (recent + frequently recalled).
+    Ek contiguous float32 matrix (L2-normalized rows), top-k = ek matmul.
+    Full hone par LRU/LFU blend se evict karta hai: har recall hit entry ki umar
+    `hit_bonus` ticks se badha deta hai, to baar-baar kaam aane wali memories tikti hain.
+    """
+    def __init__(self, capacity=2000, hit_bonus=None):
+        self.capacity = capacity
+        self.hit_bonus = hit_bonus if hit_bonus is not None else max(1, capacity // 4)
+        self.matrix = None            # (capacity, dim) float32
+        self.ids = []
+        self.docs = []
+        self.stamps = np.zeros(capacity, dtype=np.int64)
+        self.slots = {}               # id -> row
+        self.clock = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.ids)
+
+    @staticmethod
+    def normalize(vectors):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim == 1:
+            vectors = vectors[None, :]
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-8)
+
+    def add(self, ids, docs, vectors):
+        vectors = self.normalize(vectors)
+        with self.lock:
+            if self.matrix is None:
+                self.matrix = np.zeros((self.capacity, vectors.shape[1]), dtype=np.float32)
+
+            for mem_id, doc, vector in zip(ids, docs, vectors):
+                self.clock += 1
+                row = self.slots.get(mem_id)
+                if row is None:
+                    if len(self.ids) < self.capacity:
+                        row = len(self.ids)
+                        self.ids.append(mem_id)
+                        self.docs.append(doc)
+                    else:
+                        row = self._victim()
+                        del self.slots[self.ids[row]]
+                        self.ids[row] = mem_id
+                        self.docs[row] = doc
+                    self.slots[mem_id] = row
+                else:
+                    self.docs[row] = doc
+                self.matrix[row] = vector
+                self.stamps[row] = self.clock
+
+    def remove(self, ids):
+        """Compaction/delete ke baad hot set se bhi hatao (last row ko khali slot mein le aao)."""
+        with self.lock:
+            for mem_id in ids:
+                row = self.slots.pop(mem_id, None)
+                if row is None:
+                    continue
+                last = len(self.ids) - 1
+                if row != last:
+                    self.matrix[row] = self.matrix[last]
+                    self.stamps[row] = self.stamps[last]
+                    self.ids[row] = self.ids[last]
+                    self.docs[row] = self.docs[last]
+                    self.slots[self.ids[row]] = row
+                self.ids.pop()
+                self.docs.pop()
+
+    @staticmethod
+    def confident(hits, threshold):
+        """
+        Hot set se answer: top-1 hit threshold par ho to threshold paar karne wale hits, warna [].
+        (Har top-k hit ko threshold par rakhna k>=2 par kabhi pass nahi hota. Threshold se
+        neeche wale hits weak neighbours hain - sach wale shayad hot set ke bahar, isliye nahi dete.)
+        """
+        if not hits or hits[0][2] < threshold:
+            return []
+        return [hit for hit in hits if hit[2] >= threshold]
+
+    def search(self, query_vector, k=2):
+        """
+        Returns [(id, doc, score), ...] best-first. score = cosine similarity.
+        """
+        query = self.normalize(query_vector)[0]
+        with self.lock:
+            size = len(self.ids)
+            if size == 0:
+                return []
+            scores = self.matrix[:size] @ query
+            k = min(k, size)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+
+            # Recall hit = entry ko "fresh" maano (frequent memories evict nahi hongi)
+            self.clock += 1
+            self.stamps[top] = np.maximum(self.stamps[top] + self.hit_bonus, self.clock)
+            return [(self.ids[i], self.docs[i], float(scores[i])) for i in top]
+
+    def _victim(self):
+        return int(np.argmin(self.stamps[:len(self.ids)]))
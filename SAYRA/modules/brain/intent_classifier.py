@@ -0,0 +1,161 @@
+import asyncio
+import json
+import os
+import re
+import time
+import numpy as np
+import yaml
+from chromadb.utils import embedding_functions
+
+# Ulte actions: embedding mein ye paas-paas hote hain ("turn on/off sentry mode"),
+# galat polarity execute hona chup rehne se bura hai
+OPPOSITE_ACTIONS = {
+    'volume_up': 'volume_down', 'volume_down': 'volume_up',
+    'sentry_on': 'sentry_off', 'sentry_off': 'sentry_on',
+    'rest_mode': 'work_mode', 'work_mode': 'rest_mode',
+}
+
+# Negation ho to embedding par bharosa nahi ("don't mute", "mute mat karo") -> LLM planner
+NEGATION = re.compile(r"\b(?:don'?t|do not|not|never|no|nahi|nahin|mat|unmute)\b")
+
+class IntentClassifier:
+    """
+    Exemplar-based nearest-neighbour classifier (Grammar aur LLM ke beech ki layer).
+    Labelled examples ek normalized float32 matrix mein rehte hain;
+    classification = ek matmul + top-k vote. Milliseconds, no LLM.
+    """
+    def __init__(self, config_path="config/settings.yaml"):
+        with open(config_path, "r", encoding="utf-8") as f:
+            config = yaml.safe_load(f)
+
+        cfg = config['brain'].get('classifier', {})
+        self.enabled = cfg.get('enabled', True)
+        self.threshold = cfg.get('threshold', 0.75)
+        self.top_k = cfg.get('top_k', 5)
+        self.polarity_margin = cfg.get('polarity_margin', 0.1)
+        self.exemplar_path = cfg.get('exemplars', 'config/intent_exemplars.yaml')
+        self.miss_log = os.path.join(os.getcwd(), cfg.get('miss_log', 'memory_db/intent_misses.jsonl'))
+
+        # Same local ONNX model jo Chroma memory ke liye use karta hai
+        self.embedder = embedding_functions.DefaultEmbeddingFunction()
+
+        self.labels = []     # [(intent, action|None), ...]
+        self.rows = {}       # label -> exemplar row indices
+        self.matrix = None   # (n, d) float32, L2-normalized rows
+        self.build_lock = asyncio.Lock()
+
+    def load_exemplars(self):
+        with open(self.exemplar_path, "r", encoding="utf-8") as f:
+            data = yaml.safe_load(f) or {}
+
+        texts, labels = [], []
+        for intent, examples in data.items():
+            # SYSTEM_CONTROL jaise intents action-wise grouped hain
+            groups = examples.items() if isinstance(examples, dict) else [(None, examples)]
+            for action, items in groups:
+                for text in items or []:
+                    texts.append(text.lower().strip())
+                    labels.append((intent, action))
+        return texts, labels
+
+    def embed(self, texts):
+        vectors = np.asarray(self.embedder(texts), dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-8)
+
+    def build(self):
+        start = time.perf_counter()
+        texts, labels = self.load_exemplars()
+        self.matrix = self.embed(texts)
+        self.labels = labels
+        self.rows = {}
+        for i, label in enumerate(labels):
+            self.rows.setdefault(label, []).append(i)
+        self.rows = {label: np.array(rows) for label, rows in self.rows.items()}
+        print(f"[Classifier]: {len(labels)} exemplars indexed in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    async def warm(self):
+        """Exemplar matrix background mein bana do (first command fast rahe)."""
+        if not self.enabled:
+            return
+        async with self.build_lock:
+            if self.matrix is None:
+                await asyncio.to_thread(self.build)
+
+    def predict(self, text):
+        """
+        Cosine top-k vote.
+        Returns {'intent', 'action', 'score', 'margin', 'confident'}.
+        """
+        text = text.lower().strip()
+        query = self.embed([text])[0]
+        scores = self.matrix @ query
+
+        k = min(self.top_k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+
+        # Score-weighted vote among neighbours, label ke exemplar count se normalize
+        # (zyada examples wali class sirf ginti se na jeete)
+        votes = {}
+        for i in top:
+            votes[self.labels[i]] = votes.get(self.labels[i], 0.0) + float(scores[i])
+        for label in votes:
+            votes[label] /= min(k, len(self.rows[label]))
+        (intent, action), _ = max(votes.items(), key=lambda item: item[1])
+
+        # Confidence = winning label ka best single match
+        best = max(float(scores[i]) for i in top if self.labels[i] == (intent, action))
+        confident = best >= self.threshold
+
+        # Ulta action bhi utna hi paas ho to polarity pe bharosa nahi
+        margin = None
+        opposite = (intent, OPPOSITE_ACTIONS.get(action))
+        if opposite[1] and opposite in self.rows:
+            margin = best - float(scores[self.rows[opposite]].max())
+            confident = confident and margin >= self.polarity_margin
+        if intent == 'SYSTEM_CONTROL' and NEGATION.search(text):
+            confident = False
+
+        return {
+            'intent': intent,
+            'action': action,
+            'score': best,
+            'margin': margin,
+            'confident': confident
+        }
+
+    async def classify(self, text):
+        if not self.enabled:
+            return None
+        try:
+            await self.warm()
+            return await asyncio.to_thread(self.predict, text)
+        except Exception as e:
+            print(f"[Classifier Error]: {e}")
+            return None
+
+    def log_miss(self, text, guess, tasks):
+        """
+        Jab LLM ko decide karna pada: input + classifier guess + LLM ka faisla log karo.
+        Ye lines review karke intent_exemplars.yaml mein add ki ja sakti hain.
+        """
+        if not guess:
+            return
+        llm_intents = [t.get('intent') for t in tasks] or ['CHAT']
+        record = {
+            'text': text,
+            'predicted': guess['intent'],
+            'action': guess['action'],
+            'score': round(guess['score'], 3),
+            'llm': llm_intents,
+            'misclassified': guess['intent'] not in llm_intents
+        }
+        try:
+            os.makedirs(os.path.dirname(self.miss_log), exist_ok=True)
+            with open(self.miss_log, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except Exception as e:
+            print(f"[Classifier Error]: {e}")
+
+# Global Instance
+intent_classifier = IntentClassifier()
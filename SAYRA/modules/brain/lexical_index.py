@@ -0,0 +1,119 @@
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter
+
+# Sawal ke filler words - inse koi memory "match" nahi honi chahiye
+STOPWORDS = {
+    "a", "an", "the", "i", "me", "my", "you", "your", "we", "is", "am", "are", "was", "were", "be",
+    "do", "did", "does", "what", "when", "where", "who", "how", "which", "about", "say", "said",
+    "tell", "to", "of", "in", "on", "for", "and", "or", "it", "this", "that", "with", "at",
+    "kya", "ka", "ki", "ke", "ko", "hai", "tha", "thi", "main", "mera", "meri", "maine", "bola", "baare",
+}
+
+def tokenize(text):
+    return [t for t in re.findall(r"\w+", text.lower()) if t not in STOPWORDS]
+
+class LexicalIndex:
+    """
+    BM25 inverted index over stored memories (exact terms, proper nouns).
+    Embedding model ki zaroorat nahi - "salary", "Rahul" jaise lookups seedha postings se.
+    JSON file mein persist hota hai (memory_db ke saath).
+    """
+    def __init__(self, path, k1=1.5, b=0.75):
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self.postings = {}     # term -> {id: tf}
+        self.lengths = {}      # id -> token count
+        self.docs = {}         # id -> text
+        self.total_length = 0
+        self.dirty = False
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.docs)
+
+    def add(self, ids, docs):
+        with self.lock:
+            for mem_id, doc in zip(ids, docs):
+                if mem_id in self.docs:
+                    self._remove(mem_id)
+                tokens = tokenize(doc)
+                for term, tf in Counter(tokens).items():
+                    self.postings.setdefault(term, {})[mem_id] = tf
+                self.lengths[mem_id] = len(tokens)
+                self.docs[mem_id] = doc
+                self.total_length += len(tokens)
+            self.dirty = True
+
+    def remove(self, ids):
+        with self.lock:
+            for mem_id in ids:
+                if mem_id in self.docs:
+                    self._remove(mem_id)
+            self.dirty = True
+
+    def _remove(self, mem_id):
+        doc = self.docs.pop(mem_id)
+        self.total_length -= self.lengths.pop(mem_id)
+        for term in set(tokenize(doc)):
+            posting = self.postings.get(term)
+            if posting is not None:
+                posting.pop(mem_id, None)
+                if not posting:
+                    del self.postings[term]
+
+    def search(self, query, k=2):
+        """
+        Returns [(id, doc, score, coverage), ...] best-first.
+        coverage = query ke kitne (unique) terms document mein mile (0..1).
+        """
+        terms = set(tokenize(query))
+        with self.lock:
+            n = len(self.docs)
+            if not terms or n == 0:
+                return []
+            avg_length = self.total_length / n
+            scores, matched = Counter(), Counter()
+            for term in terms:
+                posting = self.postings.get(term)
+                if not posting:
+                    continue
+                idf = math.log(1 + (n - len(posting) + 0.5) / (len(posting) + 0.5))
+                for mem_id, tf in posting.items():
+                    norm = self.k1 * (1 - self.b + self.b * self.lengths[mem_id] / avg_length)
+                    scores[mem_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+                    matched[mem_id] += 1
+            return [(mem_id, self.docs[mem_id], score, matched[mem_id] / len(terms))
+                    for mem_id, score in scores.most_common(k)]
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                docs = json.load(f)
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            print(f"[Lexical Index Error]: {e}")
+            return False
+        self.add(list(docs), list(docs.values()))
+        self.dirty = False
+        return True
+
+    def save(self):
+        """Sirf documents likhte hain; postings load par rebuild (file chhoti, format simple)."""
+        with self.lock:
+            if not self.dirty:
+                return
+            snapshot = dict(self.docs)
+            self.dirty = False
+        try:
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except Exception as e:
+            print(f"[Lexical Index Error]: {e}")
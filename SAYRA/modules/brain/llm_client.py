@@ -0,0 +1,252 @@
+import asyncio
+import os
+import re
+import time
+from collections import deque
+import yaml
+import ollama
+from groq import AsyncGroq
+from dotenv import load_dotenv
+
+load_dotenv()
+
+class LLMCancelled(Exception):
+    """Raised jab nayi command aane par purani generation cancel ho jaye."""
+    pass
+
+def parse_keep_alive(value):
+    """Ollama keep_alive ("5m", "1h", "30s", 300, -1) -> seconds. None = hamesha loaded."""
+    if isinstance(value, (int, float)):
+        return None if value < 0 else float(value)
+    m = re.fullmatch(r"(-?\d+(?:\.\d+)?)\s*([smh]?)", str(value).strip())
+    if not m:
+        return 300.0
+    amount = float(m.group(1))
+    if amount < 0:
+        return None
+    return amount * {'': 1, 's': 1, 'm': 60, 'h': 3600}[m.group(2)]
+
+class StreamHandle:
+    """Ek streaming generation ka cancel flag."""
+    def __init__(self):
+        self.cancelled = False
+
+class OllamaBackend:
+    name = "ollama"
+
+    def __init__(self, host, keep_alive):
+        # AsyncClient andar httpx ka pooled (keep-alive) connection rakhta hai
+        self.client = ollama.AsyncClient(host=host)
+        self.keep_alive = keep_alive
+
+    async def chat(self, model, messages, format=None):
+        kwargs = {'keep_alive': self.keep_alive}
+        if format:
+            kwargs['format'] = format
+        response = await self.client.chat(model=model, messages=messages, **kwargs)
+        return response['message']['content']
+
+    async def stream(self, model, messages):
+        response = await self.client.chat(model=model, messages=messages,
+                                          stream=True, keep_alive=self.keep_alive)
+        async for chunk in response:
+            token = chunk['message']['content']
+            if token:
+                yield token
+
+    async def preload(self, model):
+        # Empty prompt = sirf model memory mein load karo (aur keep_alive timer reset)
+        await self.client.generate(model=model, prompt="", keep_alive=self.keep_alive)
+
+class GroqBackend:
+    name = "groq"
+
+    def __init__(self, temperature):
+        self.client = AsyncGroq(api_key=os.getenv("GROQ_API_KEY"))
+        self.temperature = temperature
+
+    async def chat(self, model, messages, format=None):
+        kwargs = {'temperature': self.temperature}
+        if format == 'json':
+            kwargs['response_format'] = {"type": "json_object"}
+        completion = await self.client.chat.completions.create(
+            messages=messages, model=model, **kwargs
+        )
+        return completion.choices[0].message.content
+
+    async def stream(self, model, messages):
+        response = await self.client.chat.completions.create(
+            messages=messages, model=model, temperature=self.temperature, stream=True
+        )
+        async for chunk in response:
+            token = chunk.choices[0].delta.content
+            if token:
+                yield token
+
+    async def preload(self, model):
+        # Cloud model hamesha warm hai
+        return None
+
+class StubBackend:
+    """
+    Offline backend (no network). Testing ke liye canned reply deta hai.
+    JSON mode mein CHAT task return karta hai taaki router fallback test ho sake.
+    """
+    name = "stub"
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+
+    async def chat(self, model, messages, format=None):
+        await asyncio.sleep(self.delay)
+        if format == 'json':
+            return '{"tasks": [{"intent": "CHAT", "entities": {}}]}'
+        return f"[stub:{model}] {messages[-1]['content']}"
+
+    async def stream(self, model, messages):
+        reply = await self.chat(model, messages)
+        for word in reply.split(" "):
+            yield word + " "
+
+    async def preload(self, model):
+        await asyncio.sleep(self.delay)
+
+class LLMClient:
+    """
+    Shared async LLM layer: ek hi client sab modules use karenge
+    (Brain, Router). Timeouts aur cancellation yahin handle hote hain.
+    """
+    def __init__(self, config_path="config/settings.yaml"):
+        with open(config_path, "r", encoding="utf-8") as f:
+            config = yaml.safe_load(f)
+
+        brain_cfg = config['brain']
+        client_cfg = brain_cfg.get('client', {})
+        self.timeout = client_cfg.get('timeout', 60)
+
+        # SAYRA_LLM_MODE=stub env se bhi offline mode on ho sakta hai
+        self.mode = os.getenv("SAYRA_LLM_MODE", client_cfg.get('mode', 'live'))
+
+        if self.mode == 'stub':
+            stub = StubBackend(delay=client_cfg.get('stub_delay', 0.0))
+            self.backends = {'ollama': stub, 'groq': stub}
+        else:
+            self.backends = {
+                'ollama': OllamaBackend(
+                    host=brain_cfg['ollama']['base_url'],
+                    keep_alive=brain_cfg['ollama'].get('keep_alive', '5m')
+                ),
+                'groq': GroqBackend(temperature=brain_cfg['groq'].get('temperature', 0.7))
+            }
+
+        # Local model residency: last activity + keep_alive se pata chalta hai model loaded hai ya nahi
+        self.keep_alive_seconds = parse_keep_alive(brain_cfg['ollama'].get('keep_alive', '5m'))
+        self.last_active = {}   # (backend, model) -> monotonic time
+        self.first_token_ms = {'cold': deque(maxlen=100), 'warm': deque(maxlen=100)}
+
+        # In-flight generations (nayi command aane par cancel honge)
+        self.inflight = set()
+        self.inflight_streams = set()
+
+    async def chat(self, backend, model, messages, format=None, timeout=None, cancellable=True):
+        """
+        Non-blocking chat call. Returns reply text.
+        Raises LLMCancelled agar cancel_inflight() ne isse rok diya.
+        cancellable=False: background kaam (warm-up) jo nayi command par na ruke.
+        """
+        coro = asyncio.wait_for(
+            self.backends[backend].chat(model, messages, format=format),
+            timeout=timeout or self.timeout
+        )
+        warm = self.is_warm(backend, model)
+        start = time.perf_counter()
+        task = asyncio.create_task(coro)
+        if cancellable:
+            self.inflight.add(task)
+        try:
+            reply = await asyncio.shield(task)
+            # Non-streaming: poora reply hi "first token" hai
+            self.touch(backend, model, start, warm)
+            return reply
+        except asyncio.CancelledError:
+            # Agar caller khud cancel hua hai to generation bhi rok do
+            if not task.done():
+                task.cancel()
+                raise
+            if task.cancelled():
+                raise LLMCancelled()
+            raise
+        finally:
+            self.inflight.discard(task)
+
+    async def stream(self, backend, model, messages, timeout=None, cancellable=True):
+        """
+        Token-by-token generation. Har token ke liye timeout lagta hai
+        (stalled stream ko hang nahi hone denge).
+        Raises LLMCancelled agar cancel_inflight() call hua (cancellable=False par nahi).
+        """
+        handle = StreamHandle()
+        if cancellable:
+            self.inflight_streams.add(handle)
+        iterator = self.backends[backend].stream(model, messages).__aiter__()
+        warm = self.is_warm(backend, model)
+        start = time.perf_counter()
+        first = True
+        try:
+            while True:
+                try:
+                    token = await asyncio.wait_for(iterator.__anext__(), timeout=timeout or self.timeout)
+                except StopAsyncIteration:
+                    break
+                if handle.cancelled:
+                    raise LLMCancelled()
+                if first:
+                    self.touch(backend, model, start, warm)
+                    first = False
+                yield token
+        finally:
+            self.inflight_streams.discard(handle)
+            if not first:
+                self.last_active[(backend, model)] = time.monotonic()
+            await iterator.aclose()
+
+    async def preload(self, backend, model, timeout=None):
+        """Model ko load karke keep_alive timer reset karo. Returns load time (ms)."""
+        start = time.perf_counter()
+        await asyncio.wait_for(self.backends[backend].preload(model), timeout=timeout or self.timeout)
+        self.last_active[(backend, model)] = time.monotonic()
+        return (time.perf_counter() - start) * 1000
+
+    def is_warm(self, backend, model, margin=0):
+        """Kya model abhi bhi loaded hoga? (sirf local backend unload hota hai)"""
+        if backend != 'ollama':
+            return True
+        last = self.last_active.get((backend, model))
+        if last is None:
+            return False
+        if self.keep_alive_seconds is None:
+            return True
+        return time.monotonic() - last < self.keep_alive_seconds - margin
+
+    def touch(self, backend, model, start, warm):
+        """First token aaya: latency record karo (local model: cold vs warm)."""
+        if backend == 'ollama':
+            self.first_token_ms['warm' if warm else 'cold'].append((time.perf_counter() - start) * 1000)
+        self.last_active[(backend, model)] = time.monotonic()
+
+    def cancel_inflight(self):
+        """Sabhi chal rahi generations cancel karo (new user command)."""
+        count = 0
+        for task in list(self.inflight):
+            if not task.done():
+                task.cancel()
+                count += 1
+        for handle in list(self.inflight_streams):
+            handle.cancelled = True
+            count += 1
+        if count:
+            print(f"[LLM]: Cancelled {count} in-flight generation(s)")
+        return count
+
+# Global Instance
+llm = LLMClient()
@@ -1,7 +1,20 @@
+import asyncio
 import chromadb
+from chromadb.utils import embedding_functions
+import numpy as np
 import os
+import queue
+import threading
+import time
 import uuid
 import yaml
+from core.subsystems import subsystems
+from modules.brain.recall_cache import RecallCache, normalize_query
+from modules.brain.hot_index import HotSetIndex
+from modules.brain.lexical_index import LexicalIndex
+
+# Compaction report ke liye fixed probe queries (before/after latency same sawalon par)
+PROBE_QUERIES = ["what is my name", "what did we talk about yesterday", "play believer", "what am I working on"]
 
 class SayraMemory:
     def __init__(self):
@@ -11,6 +24,25 @@ class SayraMemory:
             
         # Persistence setup: Data 'memory_db' folder mein save hoga
         self.db_path = os.path.join(os.getcwd(), "memory_db")
+
+        mem_cfg = self.config['brain'].get('memory', {})
+
+        # Embeddings hum khud compute karte hain taaki query vectors cache ho sakein
+        self.embedder = embedding_functions.DefaultEmbeddingFunction()
+        self.recall_cache = RecallCache(
+            max_embeddings=mem_cfg.get('recall_cache_size', 256),
+            max_results=mem_cfg.get('recall_cache_size', 256)
+        )
+        self.count = 0
+
+        # Hot set: recent/frequent memories NumPy matrix mein (Chroma se pehle check)
+        self.hot_index = HotSetIndex(capacity=mem_cfg.get('hot_set_size', 2000))
+        self.hot_threshold = mem_cfg.get('hot_threshold', 0.8)
+        self.recall_stats = {'lexical_hits': 0, 'hot_hits': 0, 'chroma_queries': 0}
+
+        # Lexical (BM25) index: exact-term sawal bina embedding ke
+        self.lexical = LexicalIndex(os.path.join(self.db_path, "lexical_index.json"))
+        self.lexical_coverage = mem_cfg.get('lexical_coverage', 1.0)
         
         try:
             # PersistentClient data ko disk par save rakhta hai
@@ -20,62 +52,366 @@ class SayraMemory:
             # 'cosine' distance use karenge similarity ke liye
             self.collection = self.client.get_or_create_collection(
                 name="sayra_long_term",
-                metadata={"hnsw:space": "cosine"}
+                metadata={"hnsw:space": "cosine"},
+                embedding_function=self.embedder
             )
-            print(f"[SAYRA]: Memory System Online ({self.collection.count()} memories)")
+            # Count ek baar padho, phir writes ke saath khud track karo
+            self.count = self.collection.count()
+            print(f"[SAYRA]: Memory System Online ({self.count} memories)")
             
         except Exception as e:
             print(f"[Memory Error]: {e}")
             self.client = None
 
+        # Write-behind: save_memory sirf queue mein daalta hai,
+        # background thread batches mein ek hi `add` call se likhta hai.
+        self.batch_size = mem_cfg.get('write_batch_size', 16)
+        self.flush_seconds = mem_cfg.get('write_flush_seconds', 5)
+        self.write_queue = queue.Queue()
+        self.buffered = 0
+        self.metrics = {'flushes': 0, 'flushed': 0, 'deduplicated': 0, 'last_flush_ms': 0.0, 'max_flush_ms': 0.0}
+
+        # Near-duplicate suppression ("play believer" x500 nahi chahiye)
+        self.dedup_threshold = mem_cfg.get('dedup_threshold', 0.95)
+
+        # Retention: har source ke liye max_age_days / max_items (compaction job enforce karta hai)
+        self.retention = mem_cfg.get('retention', {})
+        # Writer aur compaction ek saath collection na badlein
+        self.store_lock = threading.Lock()
+
+        if self.client:
+            self.writer = threading.Thread(target=self._writer, name="SayraMemoryWriter", daemon=True)
+            self.writer.start()
+
     def save_memory(self, text, source="user"):
         """
         Save any text to long-term memory.
         source: 'user' (Boss ne kaha) or 'bot' (Sayra ne kaha)
+        Non-blocking: text queue mein jata hai, writer thread batch mein likhega.
         """
         if not self.client: return
         
+        # Har memory ko unique ID chahiye
+        mem_id = str(uuid.uuid4())
+        
+        # Metadata help karega baad mein filter karne mein
+        meta = {"source": source, "timestamp": int(time.time())}
+        
+        self.write_queue.put((mem_id, text, meta))
+
+    def flush(self, timeout=10):
+        """
+        Pending writes abhi disk par likh do (shutdown se pehle call karo).
+        Blocking call hai - event loop se asyncio.to_thread ke through chalao.
+        """
+        if not self.client: return
+        done = threading.Event()
+        self.write_queue.put(done)
+        done.wait(timeout)
+
+    def stats(self):
+        """Write-behind metrics: queue depth aur flush latency."""
+        return {
+            'queue_depth': self.write_queue.qsize() + self.buffered,
+            **self.metrics
+        }
+
+    def _load_hot_set(self):
+        """Startup par sabse recent memories hot set mein load karo."""
         try:
-            # Har memory ko unique ID chahiye
-            mem_id = str(uuid.uuid4())
-            
-            # Metadata help karega baad mein filter karne mein
-            meta = {"source": source, "timestamp": "timestamp_here"} # Timestamp logic add kar sakte hain
-            
-            self.collection.add(
-                documents=[text],
-                metadatas=[meta],
-                ids=[mem_id]
-            )
-            # print(f"[Memory]: Stored -> '{text[:30]}...'")
-            
+            offset = max(0, self.count - self.hot_index.capacity)
+            data = self.collection.get(offset=offset, limit=self.hot_index.capacity,
+                                       include=['embeddings', 'documents'])
+            if data['ids']:
+                self.hot_index.add(data['ids'], data['documents'], data['embeddings'])
+            print(f"[Memory]: Hot set loaded ({len(self.hot_index)} memories)")
+        except Exception as e:
+            print(f"[Memory Hot Set Error]: {e}")
+
+    def _load_lexical(self):
+        """Lexical index disk se; file na ho ya collection se match na kare to rebuild."""
+        try:
+            if self.lexical.load() and len(self.lexical) == self.count:
+                return
+            data = self.collection.get(include=['documents'])
+            self.lexical = LexicalIndex(self.lexical.path)
+            self.lexical.add(data['ids'], data['documents'])
+            self.lexical.save()
+            print(f"[Memory]: Lexical index rebuilt ({len(self.lexical)} memories)")
+        except Exception as e:
+            print(f"[Memory Lexical Error]: {e}")
+
+    def _writer(self):
+        self._load_hot_set()
+        self._load_lexical()
+        batch = []
+        deadline = 0
+        while True:
+            timeout = max(0, deadline - time.monotonic()) if batch else None
+            try:
+                item = self.write_queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if isinstance(item, threading.Event):
+                # Flush request
+                self._write_batch(batch)
+                batch = []
+                self.buffered = 0
+                item.set()
+                continue
+
+            if item is not None:
+                if not batch:
+                    deadline = time.monotonic() + self.flush_seconds
+                batch.append(item)
+                self.buffered = len(batch)
+
+            if batch and (len(batch) >= self.batch_size or time.monotonic() >= deadline):
+                self._write_batch(batch)
+                batch = []
+                self.buffered = 0
+
+    def _write_batch(self, batch):
+        if not batch: return
+        start = time.perf_counter()
+        try:
+            # Embeddings ek baar compute karo: dedup, Chroma aur hot set teeno mein kaam aayenge
+            embeddings = HotSetIndex.normalize(self.embedder([text for _, text, _ in batch]))
+            keep, replaced = self._dedup(embeddings)
+            batch = [item for item, novel in zip(batch, keep) if novel]
+            embeddings = embeddings[keep]
+            self.metrics['deduplicated'] += len(keep) - len(batch) + len(replaced)
+
+            ids = [mem_id for mem_id, _, _ in batch]
+            documents = [text for _, text, _ in batch]
+            with self.store_lock:
+                # Purani copy hatao - nayi (updated text + fresh timestamp) uski jagah
+                if replaced:
+                    self.collection.delete(ids=replaced)
+                    self.hot_index.remove(replaced)
+                    self.lexical.remove(replaced)
+                    self.count -= len(replaced)
+                self.collection.add(
+                    ids=ids,
+                    documents=documents,
+                    metadatas=[meta for _, _, meta in batch],
+                    embeddings=embeddings.tolist()
+                )
+                self.hot_index.add(ids, documents, embeddings)
+                self.lexical.add(ids, documents)
+                self.count += len(batch)
         except Exception as e:
             print(f"[Memory Save Error]: {e}")
+            return
+
+        self.recall_cache.bump()
+        self.lexical.save()
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.metrics['flushes'] += 1
+        self.metrics['flushed'] += len(batch)
+        self.metrics['last_flush_ms'] = round(elapsed_ms, 1)
+        self.metrics['max_flush_ms'] = round(max(self.metrics['max_flush_ms'], elapsed_ms), 1)
+        # print(f"[Memory]: Flushed {len(batch)} memories in {elapsed_ms:.0f} ms")
+
+    def _dedup(self, embeddings):
+        """
+        Near-duplicates (cosine >= dedup_threshold) mein hamesha sabse nayi copy jeetti hai
+        (compaction jaisa hi): baar-baar dohrai memory fresh rahe, updated fact purane ko hataye.
+        Returns (keep mask for batch, stored ids jinhe nayi copy replace karegi).
+        """
+        keep = np.ones(len(embeddings), dtype=bool)
+
+        # 1. Batch ke andar duplicates - baad wali (nayi) copy rakho
+        sims = embeddings @ embeddings.T
+        for i in range(len(embeddings) - 2, -1, -1):
+            if np.any(sims[i, i + 1:][keep[i + 1:]] >= self.dedup_threshold):
+                keep[i] = False
+
+        # 2. Stored memories se (ek batched query) - match mila to stored copy replace
+        replaced = []
+        if self.count > 0 and keep.any():
+            results = self.collection.query(
+                query_embeddings=embeddings[keep].tolist(),
+                n_results=1,
+                include=['distances']
+            )
+            for ids, distances in zip(results['ids'], results['distances']):
+                # cosine distance = 1 - similarity
+                if distances and (1 - distances[0]) >= self.dedup_threshold and ids[0] not in replaced:
+                    replaced.append(ids[0])
+        return keep, replaced
+
+    def compact(self):
+        """
+        Retention + dedup pass over the stored collection (per source).
+        - Purane 'timestamp_here' records ko abhi ka timestamp (backfill)
+        - Near-duplicates: newest copy rakho, baaki delete
+        - max_age_days se purani aur max_items se zyada (oldest pehle) memories delete
+        Blocking - asyncio.to_thread se chalao. Returns before/after report.
+        """
+        if not self.client: return None
+
+        before = {'count': self.collection.count(), 'query_ms': self._probe_latency()}
+        removed = {}
+
+        with self.store_lock:
+            for source, rules in self.retention.items():
+                try:
+                    doomed = self._compact_source(source, rules or {})
+                except Exception as e:
+                    print(f"[Memory Compaction Error]: {source}: {e}")
+                    continue
+                if doomed:
+                    self.collection.delete(ids=doomed)
+                    self.hot_index.remove(doomed)
+                    self.lexical.remove(doomed)
+                removed[source] = len(doomed)
+            self.count = self.collection.count()
+
+        self.recall_cache.bump()
+        self.lexical.save()
+        after = {'count': self.count, 'query_ms': self._probe_latency()}
+        report = {'before': before, 'after': after, 'removed': removed}
+        print(f"[Memory]: Compaction {before['count']} -> {after['count']} memories, "
+              f"query {before['query_ms']} -> {after['query_ms']} ms")
+        return report
+
+    def _compact_source(self, source, rules):
+        """Ek source ki memories mein se delete hone wali ids."""
+        data = self.collection.get(where={"source": source}, include=['metadatas', 'embeddings'])
+        ids, metas = data['ids'], data['metadatas']
+        if not ids:
+            return []
+
+        now = int(time.time())
+        legacy = [i for i, m in enumerate(metas) if not isinstance(m.get('timestamp'), (int, float))]
+        if legacy:
+            for i in legacy:
+                metas[i] = {**metas[i], 'timestamp': now}
+            self.collection.update(ids=[ids[i] for i in legacy], metadatas=[metas[i] for i in legacy])
+
+        stamps = np.array([m['timestamp'] for m in metas], dtype=np.int64)
+        vectors = HotSetIndex.normalize(data['embeddings'])
+        max_age_days = rules.get('max_age_days')
+        max_items = rules.get('max_items')
+        cutoff = now - max_age_days * 86400 if max_age_days else None
+
+        # Newest first: duplicate cluster mein sabse nayi copy bachti hai
+        kept = np.zeros_like(vectors)
+        n_kept = 0
+        doomed = []
+        for row in np.argsort(-stamps, kind='stable'):
+            expired = cutoff is not None and stamps[row] < cutoff
+            over_cap = max_items is not None and n_kept >= max_items
+            duplicate = n_kept > 0 and np.any(kept[:n_kept] @ vectors[row] >= self.dedup_threshold)
+            if expired or over_cap or duplicate:
+                doomed.append(ids[row])
+            else:
+                kept[n_kept] = vectors[row]
+                n_kept += 1
+        return doomed
+
+    def _probe_latency(self):
+        """PROBE_QUERIES par median Chroma query latency (ms)."""
+        count = self.collection.count()
+        if count == 0:
+            return 0.0
+        timings = []
+        for query in PROBE_QUERIES:
+            embedding = self.embed_query(query)
+            start = time.perf_counter()
+            self.collection.query(query_embeddings=[embedding], n_results=min(2, count))
+            timings.append((time.perf_counter() - start) * 1000)
+        return round(float(np.median(timings)), 2)
 
     def recall(self, query, n_results=2):
         """
         Search memory for relevant context based on query.
+        Blocking (embedding + Chroma) - async code se asyncio.to_thread ke through call karo.
         """
-        if not self.client or self.collection.count() == 0:
+        if not self.client or self.count == 0:
             return ""
+
+        key = normalize_query(query)
+        generation = self.recall_cache.generation
+
+        cached = self.recall_cache.get_result(key, n_results)
+        if cached is not None:
+            return cached
             
         try:
-            results = self.collection.query(
-                query_texts=[query],
-                n_results=n_results
-            )
+            # 1. Lexical: strong term match (sab query terms mile) -> embedding skip
+            lexical = self.lexical.search(key, n_results)
+            strong = [doc for _, doc, _, coverage in lexical if coverage >= self.lexical_coverage]
+            if strong:
+                self.recall_stats['lexical_hits'] += 1
+                memories = strong
+            else:
+                memories = self._fuse(self._vector_recall(key, n_results), lexical, n_results)
             
             # Results ko clean string mein convert karo
-            memories = results['documents'][0]
-            if not memories:
-                return ""
-                
-            print(f"[Memory]: Recalled -> {memories}")
-            return "\n".join([f"- {m}" for m in memories])
+            recalled = "\n".join([f"- {m}" for m in memories]) if memories else ""
+            if memories:
+                print(f"[Memory]: Recalled -> {memories}")
+
+            self.recall_cache.put_result(key, n_results, recalled, generation)
+            return recalled
             
         except Exception as e:
             print(f"[Memory Recall Error]: {e}")
             return ""
 
-# Global Instance
-memory = SayraMemory()
\ No newline at end of file
+    def _vector_recall(self, key, n_results):
+        """Dense recall: hot set (ek matmul), warna Chroma. Returns [(id, doc), ...]."""
+        embedding = self.embed_query(key)
+
+        # Top match confident ho tabhi hot set use karo (sirf confident hits),
+        # warna sach wala neighbour shayad hot set ke bahar hai -> Chroma.
+        hot = HotSetIndex.confident(self.hot_index.search(embedding, n_results), self.hot_threshold)
+        if hot:
+            self.recall_stats['hot_hits'] += 1
+            return [(mem_id, doc) for mem_id, doc, _ in hot]
+
+        self.recall_stats['chroma_queries'] += 1
+        results = self.collection.query(
+            query_embeddings=[embedding],
+            n_results=min(n_results, self.count)
+        )
+        return list(zip(results['ids'][0], results['documents'][0]))
+
+    @staticmethod
+    def _fuse(vector_hits, lexical_hits, n_results, k=60):
+        """Reciprocal rank fusion: vector aur lexical candidates ek ranking mein."""
+        scores, docs = {}, {}
+        for hits in (vector_hits, [(mem_id, doc) for mem_id, doc, _, _ in lexical_hits]):
+            for rank, (mem_id, doc) in enumerate(hits):
+                scores[mem_id] = scores.get(mem_id, 0) + 1 / (k + rank + 1)
+                docs[mem_id] = doc
+        ranked = sorted(scores, key=scores.get, reverse=True)[:n_results]
+        return [docs[mem_id] for mem_id in ranked]
+
+    def embed_query(self, key):
+        """Query embedding (LRU cached)."""
+        embedding = self.recall_cache.get_embedding(key)
+        if embedding is None:
+            embedding = self.embedder([key])[0]
+            self.recall_cache.put_embedding(key, embedding)
+        return embedding
+
+# Global Instance (lazy: Chroma + embedding model)
+memory = subsystems.lazy('memory', SayraMemory)
+
+async def start_memory_compactor():
+    """Background job: har `compaction_hours` par memory compaction."""
+    # Memory lazy hai - event loop block na ho isliye thread mein banao
+    instance = await asyncio.to_thread(subsystems.get, 'memory')
+    mem_cfg = instance.config['brain'].get('memory', {})
+    interval = mem_cfg.get('compaction_hours', 24) * 3600
+    # Startup ke waqt models load ho rahe hote hain - thoda ruk ke pehla pass
+    await asyncio.sleep(mem_cfg.get('compaction_delay', 300))
+    while True:
+        await asyncio.to_thread(instance.flush)
+        await asyncio.to_thread(instance.compact)
+        await asyncio.sleep(interval)
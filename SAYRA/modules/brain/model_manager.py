@@ -0,0 +1,75 @@
+import asyncio
+import numpy as np
+import yaml
+from core.event_bus import bus
+from modules.brain.llm_client import llm
+
+class ModelManager:
+    """
+    Local model lifecycle (Ollama):
+    - Server start par router + chat models preload (configured keep_alive ke saath)
+    - Boss present hai to keep_alive khatam hone se pehle re-warm (pehla "Hey Sayra" cold na pade)
+    - Boss away -> re-warm band (VRAM free hone do), USER_RETURNED par turant warm
+    - Cold vs warm first-token latency llm.first_token_ms mein record hoti hai
+    """
+    def __init__(self, config_path="config/settings.yaml"):
+        with open(config_path, "r", encoding="utf-8") as f:
+            config = yaml.safe_load(f)
+
+        warm_cfg = config['brain'].get('warmup', {})
+        self.enabled = warm_cfg.get('enabled', True)
+        self.check_seconds = warm_cfg.get('check_seconds', 30)
+        self.margin_seconds = warm_cfg.get('margin_seconds', 45)
+
+        # Router aur chat dono local model use karte hain (same model ho to ek hi baar load)
+        self.models = sorted({config['brain']['ollama']['model']})
+        self.user_present = True
+        self.lock = asyncio.Lock()
+
+        bus.subscribe("USER_RETURNED", self.handle_returned)
+        bus.subscribe("USER_AWAY", self.handle_away)
+
+    async def warm(self, reason):
+        async with self.lock:
+            for model in self.models:
+                if reason != "startup" and llm.is_warm('ollama', model, margin=self.margin_seconds):
+                    continue
+                try:
+                    ms = await llm.preload('ollama', model)
+                    print(f"[Models]: {model} warm ({reason}, {ms:.0f} ms)")
+                except Exception as e:
+                    print(f"[Models Error]: {model} warm-up failed ({e})")
+
+    async def handle_returned(self, data):
+        self.user_present = True
+        await self.warm("user returned")
+
+    async def handle_away(self, data):
+        self.user_present = False
+
+    def stats(self):
+        """Cold vs warm first-token latency (ms)."""
+        report = {}
+        for kind, samples in llm.first_token_ms.items():
+            samples = list(samples)
+            report[kind] = {
+                'count': len(samples),
+                'p50_ms': round(float(np.percentile(samples, 50)), 1) if samples else None,
+                'p95_ms': round(float(np.percentile(samples, 95)), 1) if samples else None,
+            }
+        return report
+
+    async def start(self):
+        if not self.enabled:
+            return
+        await self.warm("startup")
+        while True:
+            await asyncio.sleep(self.check_seconds)
+            if self.user_present:
+                await self.warm("idle")
+
+# Global Instance
+models = ModelManager()
+
+async def start_model_manager():
+    await models.start()
@@ -0,0 +1,173 @@
+import asyncio
+import time
+import yaml
+from modules.brain.memory import memory
+from modules.brain.reflex import reflex
+from modules.brain.router import router
+from modules.brain.model_manager import models
+
+class Turn:
+    """
+    Ek user command ka state: route, background tasks aur per-stage timings (ms).
+    """
+    def __init__(self, text):
+        self.text = text
+        self.start = time.perf_counter()
+        self.route = None
+        self.timings = {}
+        self.recall = None        # memory recall task
+        self.speculation = None   # chat generation jo route aane se pehle shuru hui
+        self.tokens = None        # speculative tokens ka queue
+        self.pending = []         # history/memory saves - route CHAT confirm hone par hi
+        self.background = []
+
+    def elapsed(self):
+        return (time.perf_counter() - self.start) * 1000
+
+    def mark(self, stage, started=None):
+        """started diya ho to stage ki duration, warna turn start se time."""
+        now = self.elapsed()
+        self.timings[stage] = round(now - (started or 0), 1)
+        return now
+
+class TurnOrchestrator:
+    """
+    Turn pipeline (serial ki jagah parallel):
+    - Reflex check sabse pehle (regex, microseconds) - hit par routing hi nahi
+    - Memory recall aur model warm-up routing ke saath-saath
+    - Router `speculate_after_ms` mein decide na kare (matlab LLM planner tak gaya)
+      to chat generation speculatively shuru; route CHAT nikla to wahi tokens use,
+      warna generation cancel
+    """
+    def __init__(self, brain, config_path="config/settings.yaml"):
+        with open(config_path, "r", encoding="utf-8") as f:
+            config = yaml.safe_load(f)
+
+        self.brain = brain
+        self.streaming = config['brain'].get('streaming', False)
+        orch_cfg = config['brain'].get('orchestrator', {})
+        self.speculate = orch_cfg.get('speculate', True)
+        self.speculate_after = orch_cfg.get('speculate_after_ms', 60) / 1000
+
+    async def start(self, text):
+        """Route resolve karo. Returns Turn (turn.route set)."""
+        turn = Turn(text)
+
+        # 1. Reflex (sync, instant)
+        reflex_data = reflex.check_reflex(text.lower())
+        turn.mark('reflex')
+        if reflex_data:
+            turn.route = {'type': 'REFLEX', 'response': reflex_data}
+            return turn
+
+        # 2. Recall + warm-up + routing ek saath
+        turn.recall = asyncio.create_task(self.timed(turn, 'recall', self.recall(text)))
+        turn.background.append(asyncio.create_task(self.timed(turn, 'warm', models.warm("turn"))))
+        route_task = asyncio.create_task(self.timed(turn, 'route', router.determine_intent(text)))
+
+        # 3. Router slow hai (LLM planner) -> chat speculatively shuru
+        done, _ = await asyncio.wait({route_task}, timeout=self.speculate_after)
+        if not done and self.speculate:
+            turn.timings['speculated_at'] = round(turn.elapsed(), 1)
+            turn.tokens = asyncio.Queue()
+            turn.speculation = asyncio.create_task(self.generate(turn, turn.tokens))
+
+        try:
+            turn.route = await route_task
+        except asyncio.CancelledError:
+            self.cancel(turn)
+            raise
+
+        # Haarne wali branches band
+        if turn.route['type'] != 'CHAT':
+            self.cancel(turn)
+        return turn
+
+    async def recall(self, text):
+        # Lazy proxy lookup bhi thread mein; fail ho to bina memories ke chalo
+        try:
+            return await asyncio.to_thread(lambda: memory.recall(text))
+        except Exception as e:
+            print(f"[Turn]: Recall failed ({e!r})")
+            return ""
+
+    async def timed(self, turn, stage, coro):
+        started = turn.elapsed()
+        try:
+            return await coro
+        finally:
+            turn.mark(stage, started)
+
+    async def generate(self, turn, queue):
+        """
+        Chat generation -> queue (None = khatam). Streaming off ho to poora reply ek item.
+        History/memory save turn.pending mein rukta hai (speculation cancel ho sakti hai).
+        """
+        try:
+            memories = await turn.recall
+            # Generation ka time recall ke baad se (report mein recall alag se gina jata hai)
+            started = turn.elapsed()
+            if self.streaming:
+                async for token in self.brain.stream_response(turn.text, memories=memories, skip_reflex=True,
+                                                              commit=turn.pending.append):
+                    if 'generation_first_token' not in turn.timings:
+                        turn.mark('generation_first_token', started)
+                    queue.put_nowait(token)
+            else:
+                reply = await self.brain.generate_response(turn.text, memories=memories, skip_reflex=True,
+                                                           commit=turn.pending.append)
+                turn.mark('generation_first_token', started)
+                queue.put_nowait(reply)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"[Turn]: Generation failed ({e!r})")
+        finally:
+            queue.put_nowait(None)
+
+    async def reply_tokens(self, turn):
+        """
+        CHAT route ke tokens. Speculation chal rahi hai to usi ke tokens, warna abhi generate karo.
+        """
+        if turn.speculation is None:
+            turn.tokens = asyncio.Queue()
+            turn.speculation = asyncio.create_task(self.generate(turn, turn.tokens))
+
+        try:
+            while True:
+                token = await turn.tokens.get()
+                if token is None:
+                    break
+                if 'first_token' not in turn.timings:
+                    turn.mark('first_token')
+                yield token
+
+            # Route CHAT confirm + reply poora -> ab history/memory mein likho
+            for save in turn.pending:
+                await save()
+            turn.pending.clear()
+        finally:
+            self.cancel(turn)
+
+    def cancel(self, turn):
+        """Speculative generation aur bache hue background tasks rok do."""
+        for task in [turn.speculation, turn.recall, *turn.background]:
+            if task and not task.done():
+                task.cancel()
+
+    def report(self, turn):
+        """
+        Per-stage timing log. saved = serial pipeline (route + recall + generation)
+        minus actual time-to-first-token.
+        """
+        t = turn.timings
+        t['total'] = round(turn.elapsed(), 1)
+        parts = [f"{stage} {t[stage]:.0f}ms" for stage in ('reflex', 'route', 'recall', 'warm', 'first_token') if stage in t]
+        if 'first_token' in t and 'generation_first_token' in t:
+            serial = t.get('route', 0) + t.get('recall', 0) + t['generation_first_token']
+            t['saved'] = round(max(0.0, serial - t['first_token']), 1)
+            parts.append(f"saved ~{t['saved']:.0f}ms")
+        if 'speculated_at' in t:
+            parts.append("speculative")
+        print(f"[Turn]: {turn.route['type'] if turn.route else '?'} | " + " | ".join(parts))
+        return t
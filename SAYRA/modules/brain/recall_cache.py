@@ -0,0 +1,67 @@
+import re
+import threading
+from collections import OrderedDict
+
+def normalize_query(text):
+    # "What's my salary?" aur "whats my salary" ek hi key par aayenge
+    text = re.sub(r"[^\w\s]", "", text.lower())
+    return re.sub(r"\s+", " ", text).strip()
+
+class RecallCache:
+    """
+    Recall acceleration layer:
+    - Query embedding LRU (same sawal dobara embed nahi hoga)
+    - (query, n_results) -> recalled text LRU
+    Result cache generation counter se bound hai; har memory write generation bump karta hai
+    aur purane results apne aap invalid ho jaate hain.
+    """
+    def __init__(self, max_embeddings=256, max_results=256):
+        self.max_embeddings = max_embeddings
+        self.max_results = max_results
+        self.embeddings = OrderedDict()
+        self.results = OrderedDict()
+        self.generation = 0
+        self.lock = threading.Lock()
+        self.stats = {'embedding_hits': 0, 'embedding_misses': 0, 'result_hits': 0, 'result_misses': 0}
+
+    def bump(self):
+        """Memory collection badla (write/delete) -> cached results stale."""
+        with self.lock:
+            self.generation += 1
+
+    def get_embedding(self, key):
+        with self.lock:
+            vector = self.embeddings.get(key)
+            if vector is None:
+                self.stats['embedding_misses'] += 1
+                return None
+            self.embeddings.move_to_end(key)
+            self.stats['embedding_hits'] += 1
+            return vector
+
+    def put_embedding(self, key, vector):
+        with self.lock:
+            self.embeddings[key] = vector
+            self.embeddings.move_to_end(key)
+            while len(self.embeddings) > self.max_embeddings:
+                self.embeddings.popitem(last=False)
+
+    def get_result(self, key, n_results):
+        with self.lock:
+            entry = self.results.get((key, n_results))
+            if entry is None or entry[0] != self.generation:
+                self.stats['result_misses'] += 1
+                return None
+            self.results.move_to_end((key, n_results))
+            self.stats['result_hits'] += 1
+            return entry[1]
+
+    def put_result(self, key, n_results, value, generation):
+        with self.lock:
+            # Query ke dauraan write ho gaya to ye result pehle se stale hai
+            if generation != self.generation:
+                return
+            self.results[(key, n_results)] = (generation, value)
+            self.results.move_to_end((key, n_results))
+            while len(self.results) > self.max_results:
+                self.results.popitem(last=False)
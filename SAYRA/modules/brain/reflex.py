@@ -5,9 +5,36 @@ import re
 class ReflexSystem:
     def __init__(self):
         # Load Absolute Truths
-        config_path = os.path.join(os.getcwd(), "config", "identity.json")
-        with open(config_path, "r", encoding="utf-8") as f:
+        self.config_path = os.path.join(os.getcwd(), "config", "identity.json")
+        self.profile_mtime = None
+        self.load_profile()
+
+    def load_profile(self):
+        with open(self.config_path, "r", encoding="utf-8") as f:
             self.profile = json.load(f)
+        self.profile_mtime = os.path.getmtime(self.config_path)
+
+    def refresh(self):
+        """
+        identity.json badli ho to profile reload karo.
+        Returns True agar profile change hua.
+        """
+        try:
+            if os.path.getmtime(self.config_path) != self.profile_mtime:
+                self.load_profile()
+                print("[Reflex]: identity.json changed. Profile reloaded.")
+                return True
+        except Exception as e:
+            print(f"[Reflex Error]: {e}")
+        return False
+
+    def facts(self):
+        """Sabhi reflex facts (type -> fact). Styling precompute ke liye bhi use hota hai."""
+        return {
+            "identity_bot": f"My name is {self.profile['bot_name']}. I am a {self.profile['bot_role']} created by {self.profile['user_name']}.",
+            "identity_user": f"You are {self.profile['user_name']}, my {self.profile['user_role']}.",
+            "creator_fact": f"I was built by {self.profile['user_name']}."
+        }
 
     def check_reflex(self, text):
         """
@@ -16,6 +43,8 @@ class ReflexSystem:
         Agar nahi, to None return karta hai (matlab LLM handle kare).
         """
         text = text.lower().strip()
+        self.refresh()
+        facts = self.facts()
         
         # --- PATTERN MATCHING (Regex for robustness) ---
         
@@ -23,21 +52,21 @@ class ReflexSystem:
         if re.search(r"(who are you|your name|tum kaun ho|aap kaun ho|intro|introduction)", text):
             return {
                 "type": "identity_bot",
-                "fact": f"My name is {self.profile['bot_name']}. I am a {self.profile['bot_role']} created by {self.profile['user_name']}."
+                "fact": facts["identity_bot"]
             }
 
         # 2. User Identity (Who am I?)
         if re.search(r"(who am i|my name|main kaun hoon|do you know me)", text):
             return {
                 "type": "identity_user",
-                "fact": f"You are {self.profile['user_name']}, my {self.profile['user_role']}."
+                "fact": facts["identity_user"]
             }
 
         # 3. Creator Query
         if re.search(r"(who made you|who created you|creator)", text):
             return {
                 "type": "creator_fact",
-                "fact": f"I was built by {self.profile['user_name']}."
+                "fact": facts["creator_fact"]
             }
             
         return None
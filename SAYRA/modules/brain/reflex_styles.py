@@ -0,0 +1,69 @@
+import hashlib
+import json
+import os
+
+class ReflexStyleCache:
+    """
+    Styled reflex answers ka memo (fact -> Hinglish variants).
+    Signature = identity profile + model; dono mein se kuch bhi badla to cache reset.
+    Disk par save hota hai taaki restart ke baad dobara LLM na chalana pade.
+    """
+    def __init__(self, path="memory_db/reflex_styles.json", variants=3):
+        self.path = os.path.join(os.getcwd(), path)
+        self.variants = variants
+        self.signature = None
+        self.styles = {}     # fact -> [variant, ...]
+        self.cursor = {}     # fact -> next variant index (rotation)
+        self.load()
+
+    @staticmethod
+    def make_signature(profile, model):
+        raw = json.dumps(profile, sort_keys=True) + "|" + model
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.signature = data.get('signature')
+            self.styles = data.get('styles', {})
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"[Reflex Cache Error]: {e}")
+
+    def save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump({'signature': self.signature, 'styles': self.styles}, f, ensure_ascii=False, indent=2)
+        except Exception as e:
+            print(f"[Reflex Cache Error]: {e}")
+
+    def validate(self, profile, model):
+        """Profile ya model badla ho to purane styles hata do."""
+        signature = self.make_signature(profile, model)
+        if signature != self.signature:
+            if self.styles:
+                print("[Reflex Cache]: Identity/model changed. Styled answers invalidated.")
+            self.signature = signature
+            self.styles = {}
+            self.cursor = {}
+
+    def get(self, fact):
+        """Next variant (rotation) ya None agar abhi tak bana nahi."""
+        variants = self.styles.get(fact)
+        if not variants:
+            return None
+        index = self.cursor.get(fact, 0) % len(variants)
+        self.cursor[fact] = index + 1
+        return variants[index]
+
+    def missing(self, fact):
+        return self.variants - len(self.styles.get(fact, []))
+
+    def add(self, fact, styled):
+        variants = self.styles.setdefault(fact, [])
+        if styled and styled not in variants and len(variants) < self.variants:
+            variants.append(styled)
+            self.save()
@@ -0,0 +1,96 @@
+import hashlib
+import json
+import os
+import re
+import time
+from collections import OrderedDict
+
+class RouteCache:
+    """
+    LLM router decisions ka LRU + TTL cache (normalized utterance -> route).
+    Disk par persist hota hai; router prompt ya model badalne par signature
+    mismatch se poora cache reset ho jata hai.
+    """
+    def __init__(self, signature, path="memory_db/route_cache.json", max_entries=500, ttl_hours=72):
+        self.path = os.path.join(os.getcwd(), path)
+        self.signature = signature
+        self.max_entries = max_entries
+        self.ttl = ttl_hours * 3600
+
+        self.entries = OrderedDict()   # key -> (stored_at, route)
+        self.hits = 0
+        self.misses = 0
+        self.load()
+
+    @staticmethod
+    def make_signature(prompt, model):
+        return hashlib.sha256(f"{prompt}|{model}".encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def normalize(text):
+        # "Move all PDFs to Documents!!" == "move all pdfs to documents"
+        text = re.sub(r"[^\w\s*.]", " ", text.lower())
+        text = text.strip(" .")
+        return re.sub(r"\s+", " ", text)
+
+    def get(self, text):
+        key = self.normalize(text)
+        entry = self.entries.get(key)
+        if entry and (time.time() - entry[0]) < self.ttl:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+        if entry:
+            del self.entries[key]   # Expired
+        self.misses += 1
+        return None
+
+    def put(self, text, route):
+        key = self.normalize(text)
+        self.entries[key] = (time.time(), route)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            print(f"[Route Cache Error]: {e}")
+            return
+
+        if data.get('signature') != self.signature:
+            print("[Route Cache]: Router prompt/model changed. Cache invalidated.")
+            return
+
+        now = time.time()
+        for key, stored_at, route in data.get('entries', []):
+            if (now - stored_at) < self.ttl:
+                self.entries[key] = (stored_at, route)
+
+    def snapshot(self):
+        """Entries ki copy (event loop par lo - OrderedDict wahan badalti rehti hai)."""
+        return {
+            'signature': self.signature,
+            'entries': [[key, stored_at, route] for key, (stored_at, route) in self.entries.items()]
+        }
+
+    def save(self, data=None):
+        """Disk par likho. Thread se chalao to snapshot() pehle loop par le ke do."""
+        try:
+            data = data or self.snapshot()
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"[Route Cache Error]: {e}")
@@ -1,44 +1,13 @@
+import asyncio
 import yaml
 import json
-import ollama
 from modules.brain.reflex import reflex
+from modules.brain.grammar import grammar
+from modules.brain.intent_classifier import intent_classifier
+from modules.brain.llm_client import llm, LLMCancelled
+from modules.brain.route_cache import RouteCache
 
-class SemanticRouter:
-    def __init__(self):
-        with open("config/settings.yaml", "r", encoding="utf-8") as f:
-            config = yaml.safe_load(f)
-        self.model = config['brain']['ollama']['model']
-
-    async def determine_intent(self, text):
-        """
-        Decides: Is this a Command or Chat?
-        Returns: {'type': 'COMMAND'|'CHAT', 'intent': '...', 'entities': {...}}
-        """
-        text = text.lower().strip()
-
-        # --- LAYER 1: REFLEX (Super Fast Regex) ---
-        # Identity Checks
-        reflex_resp = reflex.check_reflex(text)
-        if reflex_resp:
-            return {'type': 'REFLEX', 'response': reflex_resp}
-
-        # Simple Commands (Keywords)
-        if text.startswith(("play ", "chalao ", "listen ", "bajaao ")):
-            song = text.replace("play ", "").replace("chalao ", "").replace("listen ", "").replace("bajaao ", "").strip()
-            return {'type': 'COMMAND', 'intent': 'MUSIC_PLAY', 'entities': {'song': song}}
-
-        if text.startswith(("open ", "launch ")):
-            app = text.replace("open ", "").replace("launch ", "").strip()
-            return {'type': 'COMMAND', 'intent': 'OPEN_APP', 'entities': {'app': app}}
-
-        if "screenshot" in text:
-            return {'type': 'COMMAND', 'intent': 'SYSTEM_CONTROL', 'entities': {'action': 'screenshot'}}
-
-        # --- LAYER 2: SEMANTIC LLM (Smart Routing) ---
-        # Agar keyword match nahi hua, to LLM se pucho
-        # "Is user trying to perform an action or just chatting?"
-        
-        system_prompt = """
+ROUTER_PROMPT = """
         You are the Action Planner for Sayra OS.
         Break down the user's input into a JSON LIST of commands.
         
@@ -46,7 +15,7 @@ class SemanticRouter:
         1. FILE_OPERATION: move/copy/delete files. Entities: action, target, source, destination.
         2. MUSIC_PLAY: Play songs. Entities: song.
         3. OPEN_APP: Launch apps. Entities: app.
-        4. SYSTEM_CONTROL: volume_up, volume_down, mute, screenshot, shutdown. Entities: action.
+        4. SYSTEM_CONTROL: volume_up, volume_down, mute, screenshot, shutdown, brightness, sentry_on, sentry_off, rest_mode, work_mode. Entities: action, level (brightness 0-100).
         5. WEB_SEARCH: Google search. Entities: query.
         6. CHAT: General conversation (Use this only if no other intent matches).
 
@@ -71,15 +40,90 @@ class SemanticRouter:
             ]
         }
         """
-        
+
+class SemanticRouter:
+    def __init__(self):
+        with open("config/settings.yaml", "r", encoding="utf-8") as f:
+            config = yaml.safe_load(f)
+        self.model = config['brain']['ollama']['model']
+
+        # LLM routing decisions ka persistent cache (prompt+model signature se bound)
+        cache_cfg = config['brain'].get('route_cache', {})
+        self.cache = RouteCache(
+            signature=RouteCache.make_signature(ROUTER_PROMPT, self.model),
+            path=cache_cfg.get('path', 'memory_db/route_cache.json'),
+            max_entries=cache_cfg.get('max_entries', 500),
+            ttl_hours=cache_cfg.get('ttl_hours', 72)
+        )
+        self.save_delay = cache_cfg.get('save_delay_seconds', 1.0)
+        self.save_task = None
+
+    async def determine_intent(self, text):
+        """
+        Decides: Is this a Command or Chat?
+        Returns: {'type': 'REFLEX'|'BATCH'|'CHAT', 'tasks': [...]}
+        """
+        text = text.lower().strip()
+
+        # --- LAYER 1: REFLEX (Super Fast Regex) ---
+        # Identity Checks
+        reflex_resp = reflex.check_reflex(text)
+        if reflex_resp:
+            return {'type': 'REFLEX', 'response': reflex_resp}
+
+        # Compiled Intent Grammar (declarative rules + compound split)
+        tasks = grammar.parse(text)
+        if tasks:
+            return {'type': 'BATCH', 'tasks': tasks}
+
+        # --- LAYER 1.5: EXEMPLAR CLASSIFIER (Embedding nearest-neighbour) ---
+        # Confident CHAT ya entity-free SYSTEM_CONTROL ke liye LLM ki zarurat nahi.
+        # (Negation / ulte action se kam margin par classifier confident nahi hota -> planner)
+        # Free-form entities (song, app, query, files) ke liye LLM hi chahiye.
+        guess = await intent_classifier.classify(text)
+        if guess and guess['confident']:
+            if guess['intent'] == 'CHAT':
+                return {'type': 'CHAT'}
+            if guess['intent'] == 'SYSTEM_CONTROL' and guess['action']:
+                return {'type': 'BATCH', 'tasks': [
+                    {'intent': 'SYSTEM_CONTROL', 'entities': {'action': guess['action']}}
+                ]}
+
+        # --- LAYER 2: SEMANTIC LLM (Smart Routing) ---
+        # Agar keyword match nahi hua, to LLM se pucho
+        # "Is user trying to perform an action or just chatting?"
+
+        cached = self.cache.get(text)
+        if cached:
+            print(f"[Router]: Cache hit (hit rate {self.cache.hit_rate():.0%})")
+            return cached
+
+        route = await self.plan_with_llm(text, guess)
+        if route['type'] in ('BATCH', 'CHAT') and not route.get('fallback'):
+            self.cache.put(text, route)
+            self.schedule_save()
+        return route
+
+    def schedule_save(self):
+        """Cache file write debounce: misses ki burst par ek hi write."""
+        if self.save_task is None or self.save_task.done():
+            self.save_task = asyncio.create_task(self.save_cache())
+
+    async def save_cache(self):
+        await asyncio.sleep(self.save_delay)
+        # Entries loop par hi copy karo; thread sirf snapshot likhe (beech mein get/put safe)
+        data = self.cache.snapshot()
+        await asyncio.to_thread(self.cache.save, data)
+
+    async def plan_with_llm(self, text, guess):
         try:
             # Use Ollama to classify (Force JSON mode if possible, else parse)
-            response = ollama.chat(model=self.model, messages=[
-                {'role': 'system', 'content': system_prompt},
+            content = await llm.chat('ollama', self.model, [
+                {'role': 'system', 'content': ROUTER_PROMPT},
                 {'role': 'user', 'content': f"Input: {text}"}
             ], format='json') # 'json' format is supported in newer Ollama versions
             
-            result = json.loads(response['message']['content'])
+            result = json.loads(content)
             
             # Standardization: Ensure we always return a list wrapper
             tasks = result.get('tasks', [])
@@ -87,6 +131,9 @@ class SemanticRouter:
             # Agar LLM ne single object diya galti se, to list bana do
             if isinstance(result, dict) and 'tasks' not in result and 'intent' in result:
                 tasks = [result]
+
+            # Classifier kya soch raha tha vs LLM ka faisla (exemplar set grow karne ke liye)
+            intent_classifier.log_miss(text, guess, tasks)
             
             # Agar koi task nahi mila, to CHAT maan lo
             if not tasks:
@@ -99,10 +146,13 @@ class SemanticRouter:
 
             return {'type': 'BATCH', 'tasks': tasks}
 
+        except LLMCancelled:
+            # Nayi command aa gayi, ye routing ab irrelevant hai
+            return {'type': 'CANCELLED'}
         except Exception as e:
             # Fallback to Chat if routing fails
             print(f"[Router Error]: {e}")
-            return {'type': 'CHAT'}
+            return {'type': 'CHAT', 'fallback': True}
 
 # Global Instance
 router = SemanticRouter()
\ No newline at end of file
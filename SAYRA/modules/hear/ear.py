@@ -1,8 +1,9 @@
 import speech_recognition as sr
 from faster_whisper import WhisperModel
-import os
 import yaml
-import asyncio
+from core.subsystems import subsystems
+from modules.hear.transcriber import SAMPLE_RATE, Transcriber, pcm_to_float32, transcribe_options
+from modules.hear.stream_asr import StreamingRecognizer
 
 class SayraEar:
     def __init__(self):
@@ -16,6 +17,22 @@ class SayraEar:
         
         print(f"[SAYRA]: Loading Ear Model ({self.model_size})...")
         self.model = WhisperModel(self.model_size, device=self.device, compute_type=self.compute_type)
+        # Beam size / VAD / language / initial_prompt -> hearing.transcribe
+        self.transcriber = Transcriber(self.model, transcribe_options(self.config['hearing']))
+
+        # Streaming mode: VAD endpointing + partial transcripts
+        stream_cfg = self.config['hearing'].get('streaming', {})
+        self.streaming = stream_cfg.get('enabled', True)
+        self.frame_ms = stream_cfg.get('frame_ms', 30)
+        self.stream_asr = StreamingRecognizer(
+            self.transcriber,
+            frame_ms=self.frame_ms,
+            endpoint_ms=stream_cfg.get('endpoint_ms', 400),
+            partial_interval_ms=stream_cfg.get('partial_interval_ms', 600),
+            preroll_ms=stream_cfg.get('preroll_ms', 300),
+            max_seconds=stream_cfg.get('max_seconds', 10),
+            start_timeout=stream_cfg.get('start_timeout', 5)
+        )
         self.recognizer = sr.Recognizer()
         self.mic = sr.Microphone()
         
@@ -23,8 +40,13 @@ class SayraEar:
         with self.mic as source:
             self.recognizer.adjust_for_ambient_noise(source, duration=1)
 
-    def listen(self):
-        """Captures audio and transcribes it locally"""
+    def listen(self, on_partial=None):
+        """
+        Captures audio and transcribes it locally.
+        on_partial(text): streaming mode mein bolte waqt ke partial transcripts (worker thread se).
+        """
+        if self.streaming:
+            return self.listen_streaming(on_partial)
         try:
             with self.mic as source:
                 print("\n[SAYRA]: Listening... (Speak now)")
@@ -32,22 +54,9 @@ class SayraEar:
                 # Phrase_time_limit: Max 10 sec ki baat sunegi
                 audio = self.recognizer.listen(source, timeout=5, phrase_time_limit=10)
             
-            # Save temp audio for Whisper
-            with open("temp_command.wav", "wb") as f:
-                f.write(audio.get_wav_data())
-            
-            # Transcribe
-            segments, info = self.model.transcribe("temp_command.wav", beam_size=5)
-            
-            user_text = ""
-            for segment in segments:
-                user_text += segment.text
-            
-            # Cleanup
-            if os.path.exists("temp_command.wav"):
-                os.remove("temp_command.wav")
-                
-            return user_text.strip()
+            # PCM seedha memory mein (16 kHz, 16-bit) -> float32, koi temp file nahi
+            samples = pcm_to_float32(audio.get_raw_data(convert_rate=SAMPLE_RATE, convert_width=2))
+            return self.transcriber.transcribe(samples)
 
         except sr.WaitTimeoutError:
             return None
@@ -55,5 +64,20 @@ class SayraEar:
             print(f"[Ear Error]: {e}")
             return None
 
-# Global Instance
-ear = SayraEar()
\ No newline at end of file
+    def listen_streaming(self, on_partial=None):
+        try:
+            with self.mic as source:
+                print("\n[SAYRA]: Listening... (Speak now)")
+                frame_size = int(source.SAMPLE_RATE * self.frame_ms / 1000)
+                return self.stream_asr.recognize(
+                    lambda: source.stream.read(frame_size),
+                    source.SAMPLE_RATE,
+                    self.recognizer.energy_threshold,
+                    on_partial
+                ) or None
+        except Exception as e:
+            print(f"[Ear Error]: {e}")
+            return None
+
+# Global Instance (lazy: Whisper model + mic calibration server start ke baad background mein)
+ear = subsystems.lazy('ear', SayraEar)
\ No newline at end of file
@@ -0,0 +1,84 @@
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from modules.hear.transcriber import pcm_to_float32, resample
+
+class StreamingRecognizer:
+    """
+    Streaming ASR: bolte waqt hi transcription.
+    - Energy VAD har frame par (calibrated energy_threshold, extra dependency nahi)
+    - Bolte hue har `partial_interval` par ab tak ka audio decode -> on_partial(text)
+      (alag worker thread mein, taaki mic capture kabhi na ruke)
+    - `endpoint` jitni silence = baat khatam -> turant final decode
+    """
+    def __init__(self, transcriber, frame_ms=30, endpoint_ms=400, partial_interval_ms=600,
+                 preroll_ms=300, max_seconds=10, start_timeout=5):
+        self.transcriber = transcriber
+        self.frame_ms = frame_ms
+        self.endpoint = endpoint_ms / 1000
+        self.partial_interval = partial_interval_ms / 1000
+        self.preroll_frames = max(1, preroll_ms // frame_ms)
+        self.max_seconds = max_seconds
+        self.start_timeout = start_timeout
+        self.pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="SayraASR")
+        self.last_finalize_ms = 0.0
+
+    def is_speech(self, frame, threshold):
+        # speech_recognition ka energy_threshold int16 RMS scale par hai
+        return np.sqrt(np.mean(np.square(frame))) * 32768 > threshold
+
+    def recognize(self, read_frame, rate, threshold, on_partial=None):
+        """
+        read_frame(): ek frame (frame_ms) ke 16-bit PCM bytes, `rate` Hz par. Blocking.
+        Returns final text, ya None agar start_timeout tak koi nahi bola.
+        """
+        frame_s = self.frame_ms / 1000
+
+        # 1. Speech start ka intezaar (thoda pre-roll rakho taaki pehla syllable na kate)
+        preroll = deque(maxlen=self.preroll_frames)
+        waited = 0.0
+        while True:
+            frame = pcm_to_float32(read_frame())
+            if self.is_speech(frame, threshold):
+                break
+            preroll.append(frame)
+            waited += frame_s
+            if waited >= self.start_timeout:
+                return None
+
+        # 2. Bolte waqt: frames jodo, beech-beech mein partial decode
+        chunks = [*preroll, frame]
+        spoken, silence, since_partial = frame_s, 0.0, 0.0
+        pending = None
+        while spoken < self.max_seconds:
+            frame = pcm_to_float32(read_frame())
+            chunks.append(frame)
+            spoken += frame_s
+            silence = 0.0 if self.is_speech(frame, threshold) else silence + frame_s
+            if silence >= self.endpoint:
+                break
+
+            since_partial += frame_s
+            if on_partial and since_partial >= self.partial_interval and (pending is None or pending.done()):
+                since_partial = 0.0
+                audio = resample(np.concatenate(chunks), rate)
+                pending = self.pool.submit(self._partial, audio, on_partial)
+
+        # 3. Endpoint: final decode (chal raha partial pehle khatam hone do - model ek hi hai)
+        start = time.perf_counter()
+        if pending is not None:
+            pending.result()
+        text = self.transcriber.transcribe(resample(np.concatenate(chunks), rate))
+        self.last_finalize_ms = self.endpoint * 1000 + (time.perf_counter() - start) * 1000
+        print(f"[Ear]: Final transcript {self.last_finalize_ms:.0f} ms after end of speech")
+        return text
+
+    def _partial(self, audio, on_partial):
+        try:
+            # Partials sirf dikhane ke liye: VAD filter skip (tez)
+            text = self.transcriber.transcribe(audio, vad_filter=False)
+            if text:
+                on_partial(text)
+        except Exception as e:
+            print(f"[Ear Partial Error]: {e}")
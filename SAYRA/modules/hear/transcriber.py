@@ -0,0 +1,49 @@
+import numpy as np
+import yaml
+
+SAMPLE_RATE = 16000  # Whisper isi rate par chalta hai
+
+def pcm_to_float32(raw):
+    """16-bit mono PCM bytes -> float32 array [-1, 1] (seedha model ko, file nahi)."""
+    return np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32768.0
+
+def resample(samples, rate):
+    """Mic ka native rate (44.1k/48k) -> 16 kHz (linear interpolation, commands ke liye kaafi)."""
+    if rate == SAMPLE_RATE:
+        return samples
+    positions = np.arange(0, len(samples), rate / SAMPLE_RATE)
+    return np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+
+def build_initial_prompt(base="", apps_path="config/apps.yaml"):
+    """
+    Decoder ko app names pehle se dikha do ("vscode", "notepad" galat spell na hon).
+    """
+    try:
+        with open(apps_path, "r", encoding="utf-8") as f:
+            apps = (yaml.safe_load(f) or {}).get('apps', {}) or {}
+    except FileNotFoundError:
+        apps = {}
+    names = ", ".join(apps)
+    return " ".join(part for part in (base.strip(), names) if part) or None
+
+def transcribe_options(hearing_cfg):
+    """settings.yaml ke hearing.transcribe se faster-whisper kwargs."""
+    cfg = hearing_cfg.get('transcribe', {})
+    base_prompt = cfg.get('initial_prompt', "")
+    return {
+        'beam_size': cfg.get('beam_size', 1),
+        'vad_filter': cfg.get('vad_filter', True),
+        'language': cfg.get('language') or None,
+        'initial_prompt': build_initial_prompt(base_prompt) if cfg.get('prompt_apps', True) else (base_prompt or None),
+    }
+
+class Transcriber:
+    """faster-whisper wrapper: in-memory float32 audio -> text."""
+    def __init__(self, model, options):
+        self.model = model
+        self.options = options
+
+    def transcribe(self, samples, **overrides):
+        segments, info = self.model.transcribe(samples, **{**self.options, **overrides})
+        # segments lazy generator hai - join karte waqt hi decode hota hai
+        return "".join(segment.text for segment in segments).strip()
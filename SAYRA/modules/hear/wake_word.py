@@ -5,6 +5,7 @@ import os
 import yaml
 import sys
 from dotenv import load_dotenv
+from core.subsystems import subsystems
 
 load_dotenv()
 
@@ -112,5 +113,5 @@ class WakeWordListener:
         if self.pa:
             self.pa.terminate()
 
-# Global Instance
-wake_listener = WakeWordListener()
\ No newline at end of file
+# Global Instance (lazy: Porcupine + PyAudio stream)
+wake_listener = subsystems.lazy('wake_word', WakeWordListener)
\ No newline at end of file
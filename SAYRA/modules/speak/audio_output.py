@@ -0,0 +1,95 @@
+import asyncio
+import io
+import itertools
+import queue
+import threading
+import time
+import pygame
+
+# Priority levels (chhota number = pehle bajega)
+PRIORITY_ALERT = 0   # System alerts, vision break - chat ko beech mein rok dete hain
+PRIORITY_CHAT = 1    # Normal replies
+PRIORITY_LOW = 2     # Greetings, "tasks completed" - purane ho gaye to drop
+
+class AudioOutput:
+    """
+    Long-lived audio worker (apna thread).
+    pygame mixer sirf ek baar init hota hai; event loop kabhi block nahi hota.
+    """
+    def __init__(self, stale_after=15):
+        self.stale_after = stale_after
+        self.queue = queue.PriorityQueue()
+        self.counter = itertools.count()
+        self.interrupt = threading.Event()
+        self.current_priority = None
+        self.ready = False
+
+        self.thread = threading.Thread(target=self._worker, name="SayraAudioOutput", daemon=True)
+        self.thread.start()
+
+    async def play(self, audio, priority=PRIORITY_CHAT):
+        """
+        Audio bytes queue mein daalo aur playback khatam hone tak wait karo.
+        Returns True agar poora baja, False agar drop/preempt hua.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.queue.put((priority, next(self.counter), time.monotonic(), audio, loop, future))
+
+        # Higher priority aaya -> jo chal raha hai use rok do
+        current = self.current_priority
+        if current is not None and priority < current:
+            self.interrupt.set()
+
+        return await future
+
+    def _resolve(self, loop, future, result):
+        def setter():
+            if not future.done():
+                future.set_result(result)
+        loop.call_soon_threadsafe(setter)
+
+    def _worker(self):
+        try:
+            pygame.mixer.init()
+            self.ready = True
+        except Exception as e:
+            print(f"[Audio Error]: Mixer init failed: {e}")
+
+        while True:
+            priority, _, queued_at, audio, loop, future = self.queue.get()
+
+            # Low priority lines purani ho gayi to bolne ka fayda nahi
+            if priority >= PRIORITY_LOW and (time.monotonic() - queued_at) > self.stale_after:
+                print("[Audio]: Dropped stale low-priority line")
+                self._resolve(loop, future, False)
+                continue
+
+            if future.cancelled() or not self.ready:
+                self._resolve(loop, future, False)
+                continue
+
+            self._resolve(loop, future, self._play_clip(audio, priority))
+
+    def _play_clip(self, audio, priority):
+        self.interrupt.clear()
+        self.current_priority = priority
+        try:
+            pygame.mixer.music.load(io.BytesIO(audio))
+            pygame.mixer.music.play()
+
+            # Worker thread par wait - event loop free rehta hai
+            while pygame.mixer.music.get_busy():
+                if self.interrupt.wait(0.02):
+                    pygame.mixer.music.stop()
+                    print("[Audio]: Playback preempted by higher priority audio")
+                    return False
+
+            pygame.mixer.music.unload()
+            return True
+
+        except Exception as e:
+            print(f"[Audio Error]: {e}")
+            return False
+        finally:
+            self.current_priority = None
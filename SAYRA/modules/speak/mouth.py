@@ -1,52 +1,143 @@
 import edge_tts
-import pygame
 import asyncio
-import os
+import re
+import time
 import yaml
+from modules.speak.audio_output import AudioOutput, PRIORITY_CHAT
+from modules.speak.tts_cache import PhraseCache
+
+# Sentence boundary: . ! ? aur Hindi danda (।) ke baad whitespace
+SENTENCE_END = re.compile(r'(?<=[.!?।])\s+')
+
+def pop_sentences(buffer):
+    """
+    Streaming text buffer se complete sentences nikaalta hai.
+    Returns (sentences, remaining_buffer).
+    """
+    parts = SENTENCE_END.split(buffer)
+    return [p.strip() for p in parts[:-1] if p.strip()], parts[-1]
+
+def split_sentences(text):
+    """Poore text ko sentences mein todta hai (TTS chunks)."""
+    sentences, rest = pop_sentences(text)
+    if rest.strip():
+        sentences.append(rest.strip())
+    return sentences
 
 class SayraMouth:
     def __init__(self):
         with open("config/settings.yaml", "r", encoding="utf-8") as f:
             config = yaml.safe_load(f)
-        
+
         self.voice = config['speech']['voice']
         self.rate = config['speech']['rate']
         self.volume = config['speech']['volume']
-        self.output_file = "sayra_voice_temp.mp3"
 
-    async def speak(self, text):
-        """Text ko Audio me convert karke play karega"""
+        # Persistent audio worker (mixer ek hi baar init hota hai)
+        self.output = AudioOutput(stale_after=config['speech'].get('stale_after', 15))
+
+        # Repeated phrases (alerts, greetings) ke liye audio cache
+        cache_cfg = config['speech'].get('cache', {})
+        self.cache = PhraseCache(
+            path=cache_cfg.get('path', 'tts_cache'),
+            memory_mb=cache_cfg.get('memory_mb', 16),
+            disk_mb=cache_cfg.get('disk_mb', 128)
+        )
+
+        # Latency stats (ms) - har utterance ka first-audio time
+        self.last_first_audio_ms = None
+
+    async def speak(self, text, priority=PRIORITY_CHAT):
+        """
+        Text ko Audio me convert karke play karega.
+        Playback khatam hone par return karta hai (event loop block nahi hota).
+        """
         if not text:
             return
 
         # Terminal feedback
         print(f"SAYRA (🔊): {text}")
 
-        # Generate Audio
-        communicate = edge_tts.Communicate(text, self.voice, rate=self.rate, volume=self.volume)
-        await communicate.save(self.output_file)
+        async def sentences():
+            for sentence in split_sentences(text):
+                yield sentence
+
+        await self.speak_pipelined(sentences(), priority)
+
+    async def speak_queue(self, queue, priority=PRIORITY_CHAT):
+        """
+        Queue se sentences utha ke bolta rehta hai jab tak None na aaye.
+        Streaming replies ke liye: LLM aage likhta rahe, Sayra pehla sentence bol de.
+        """
+        async def sentences():
+            while True:
+                sentence = await queue.get()
+                if sentence is None:
+                    return
+                yield sentence
+
+        await self.speak_pipelined(sentences(), priority)
+
+    async def speak_pipelined(self, sentences, priority=PRIORITY_CHAT):
+        """
+        Pipeline: chunk N play ho raha hai tab tak chunk N+1 synthesize hota hai.
+        sentences: async iterator of text chunks.
+        """
+        start = time.perf_counter()
+        first_audio = True
+        iterator = sentences.__aiter__()
+
+        async def next_audio():
+            try:
+                sentence = await iterator.__anext__()
+            except StopAsyncIteration:
+                return None
+            return await self.synthesize(sentence)
+
+        pending = asyncio.create_task(next_audio())
+        try:
+            while True:
+                audio = await pending
+                if audio is None:
+                    break
+
+                # Agla chunk abhi se banna shuru (play ke saath overlap)
+                pending = asyncio.create_task(next_audio())
+
+                if not audio:
+                    continue
+                if first_audio:
+                    first_audio = False
+                    self.last_first_audio_ms = (time.perf_counter() - start) * 1000
+                    print(f"[Mouth]: First audio in {self.last_first_audio_ms:.0f} ms")
+
+                await self.output.play(audio, priority)
+        finally:
+            pending.cancel()
+
+    async def synthesize(self, text):
+        """Cache check karo, warna edge-tts se naya audio banao."""
+        key = PhraseCache.make_key(text, self.voice, self.rate, self.volume)
+        audio = await self.cache.get(key)
+        if audio is not None:
+            return audio
 
-        # Play Audio
-        self.play_audio()
+        audio = await self.synthesize_fresh(text)
+        await self.cache.put(key, audio)
+        return audio
 
-    def play_audio(self):
+    async def synthesize_fresh(self, text):
+        """edge-tts se MP3 bytes memory mein (no temp file)."""
         try:
-            pygame.mixer.init()
-            pygame.mixer.music.load(self.output_file)
-            pygame.mixer.music.play()
-            
-            # Wait for audio to finish
-            while pygame.mixer.music.get_busy():
-                pygame.time.Clock().tick(10)
-                
-            pygame.mixer.quit()
-            
-            # Cleanup temp file
-            if os.path.exists(self.output_file):
-                os.remove(self.output_file)
-                
+            communicate = edge_tts.Communicate(text, self.voice, rate=self.rate, volume=self.volume)
+            audio = bytearray()
+            async for chunk in communicate.stream():
+                if chunk["type"] == "audio":
+                    audio.extend(chunk["data"])
+            return bytes(audio)
         except Exception as e:
             print(f"[Mouth Error]: {e}")
+            return b""
 
 # Global instance
-mouth = SayraMouth()
\ No newline at end of file
+mouth = SayraMouth()
@@ -0,0 +1,117 @@
+import asyncio
+import hashlib
+import os
+from collections import OrderedDict
+
+class PhraseCache:
+    """
+    Two-level TTS cache (Memory + Disk).
+    Key = (text, voice, rate, volume) ka hash, value = MP3 bytes.
+    Dono levels size-bounded LRU hain.
+    """
+    def __init__(self, path="tts_cache", memory_mb=16, disk_mb=128):
+        self.path = os.path.join(os.getcwd(), path)
+        self.memory_limit = memory_mb * 1024 * 1024
+        self.disk_limit = disk_mb * 1024 * 1024
+
+        self.memory = OrderedDict()
+        self.memory_bytes = 0
+
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0}
+
+        os.makedirs(self.path, exist_ok=True)
+
+    @staticmethod
+    def make_key(text, voice, rate, volume):
+        raw = f"{text.strip()}|{voice}|{rate}|{volume}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    async def get(self, key):
+        # Level 1: Memory
+        audio = self.memory.get(key)
+        if audio is not None:
+            self.memory.move_to_end(key)
+            self.stats['memory_hits'] += 1
+            return audio
+
+        # Level 2: Disk
+        audio = await asyncio.to_thread(self._read_disk, key)
+        if audio is not None:
+            self.stats['disk_hits'] += 1
+            self._remember(key, audio)
+            return audio
+
+        self.stats['misses'] += 1
+        return None
+
+    async def put(self, key, audio):
+        if not audio:
+            return
+        self._remember(key, audio)
+        await asyncio.to_thread(self._write_disk, key, audio)
+
+    def hit_rate(self):
+        hits = self.stats['memory_hits'] + self.stats['disk_hits']
+        total = hits + self.stats['misses']
+        return hits / total if total else 0.0
+
+    def _remember(self, key, audio):
+        if key in self.memory:
+            self.memory_bytes -= len(self.memory.pop(key))
+        self.memory[key] = audio
+        self.memory_bytes += len(audio)
+
+        # LRU eviction
+        while self.memory_bytes > self.memory_limit and len(self.memory) > 1:
+            _, old = self.memory.popitem(last=False)
+            self.memory_bytes -= len(old)
+
+    def _file(self, key):
+        return os.path.join(self.path, f"{key}.mp3")
+
+    def _read_disk(self, key):
+        file_path = self._file(key)
+        try:
+            with open(file_path, "rb") as f:
+                audio = f.read()
+            # mtime update = disk LRU ke liye "recently used"
+            os.utime(file_path, None)
+            return audio
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"[TTS Cache Error]: {e}")
+            return None
+
+    def _write_disk(self, key, audio):
+        try:
+            tmp_path = self._file(key) + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(audio)
+            os.replace(tmp_path, self._file(key))
+            self._evict_disk()
+        except Exception as e:
+            print(f"[TTS Cache Error]: {e}")
+
+    def _evict_disk(self):
+        entries = []
+        total = 0
+        with os.scandir(self.path) as it:
+            for entry in it:
+                if entry.name.endswith(".mp3"):
+                    st = entry.stat()
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+                    total += st.st_size
+
+        if total <= self.disk_limit:
+            return
+
+        # Sabse purane (least recently used) pehle hatao
+        for _, size, file_path in sorted(entries):
+            if total <= self.disk_limit:
+                break
+            try:
+                os.remove(file_path)
+                total -= size
+            except OSError:
+                pass
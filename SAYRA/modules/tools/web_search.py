@@ -1,40 +1,211 @@
 import asyncio
-from ddgs import DDGS
+import os
+import re
+import time
+import yaml
+from collections import OrderedDict
+
+# Sawal ke filler words (keyword reformulation ke liye)
+QUESTION_WORDS = {"what", "whats", "who", "when", "where", "why", "how", "is", "are", "the", "a", "an",
+                  "of", "about", "tell", "me", "please", "kya", "hai", "batao", "kaun", "kab", "kaise"}
+
+# Query ke shuru mein command phrase ("find out who won" -> "who won")
+COMMAND_PREFIX = re.compile(r"^(?:find out|find|search(?: for)?|look up|google)\s+")
+
+# Query pehle se hi freshness maang rahi ho to "latest" variant bekaar hai
+FRESHNESS_WORDS = {"latest", "today", "now", "current", "new", "newest", "recent", "aaj", "abhi"}
+
+def normalize_query(text):
+    text = re.sub(r"[^\w\s]", "", text.lower())
+    return re.sub(r"\s+", " ", text).strip()
+
+def truncate(text, limit):
+    if len(text) <= limit:
+        return text
+    return text[:limit].rsplit(" ", 1)[0] + "..."
+
+class DDGSBackend:
+    """DuckDuckGo ('ddgs'). Ek hi session reuse hota hai (har call par naya connection nahi)."""
+    name = "ddgs"
 
-class WebSearch:
     def __init__(self):
-        pass 
+        from ddgs import DDGS
+        self.session = DDGS()
+
+    def text(self, query, max_results):
+        # Blocking call - WebSearch ise thread mein chalata hai
+        return list(self.session.text(query, max_results=max_results))
+
+class OfflineBackend:
+    """
+    Network ke bina canned results (testing). Query se deterministic results banata hai.
+    """
+    name = "offline"
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = 0
+
+    def text(self, query, max_results):
+        self.calls += 1
+        time.sleep(self.delay)
+        slug = normalize_query(query).replace(" ", "-")
+        return [{'title': f"{query} ({i})", 'href': f"https://offline.test/{slug}/{i}",
+                 'body': f"Offline result {i} for '{query}'."} for i in range(1, max_results + 1)]
+
+class WebSearch:
+    """
+    Async search service.
+    - TTL cache (normalized query -> merged results)
+    - Same query already in flight -> usi ka result share (coalescing)
+    - Query ke kuch reformulations concurrently, results merge + dedupe
+    - Snippets budget tak truncate (brain ka prompt chhota rahe)
+    """
+    def __init__(self, config_path="config/settings.yaml", backend=None):
+        with open(config_path, "r", encoding="utf-8") as f:
+            config = yaml.safe_load(f)
+
+        cfg = config.get('tools', {}).get('web_search', {})
+        self.ttl = cfg.get('cache_ttl_minutes', 30) * 60
+        self.max_entries = cfg.get('cache_size', 128)
+        self.fanout = cfg.get('fanout', 3)
+        self.timeout = cfg.get('timeout', 8)
+        self.snippet_chars = cfg.get('snippet_chars', 300)
+        self.total_chars = cfg.get('total_chars', 1200)
+
+        # SAYRA_SEARCH_MODE=offline env se bhi offline backend
+        mode = os.getenv("SAYRA_SEARCH_MODE", cfg.get('backend', 'ddgs'))
+        self.backend = backend or (OfflineBackend() if mode == 'offline' else None)
+        self.mode = mode
+
+        self.cache = OrderedDict()   # key -> (expires_at, results)
+        self.inflight = {}           # key -> Future
+        self.stats = {'hits': 0, 'misses': 0, 'coalesced': 0}
+
+    def get_backend(self):
+        # ddgs import pehli search tak lazy (startup fast)
+        if self.backend is None:
+            self.backend = DDGSBackend()
+        return self.backend
 
-    def search(self, query, max_results=3):
+    def reformulations(self, query):
+        """Original + keyword-only + freshness variant (duplicates hata ke)."""
+        stripped = COMMAND_PREFIX.sub("", normalize_query(query))
+        keywords = " ".join(w for w in stripped.split() if w not in QUESTION_WORDS)
+        variants = [query]
+        if keywords:
+            variants.append(keywords)
+            if not FRESHNESS_WORDS & set(keywords.split()):
+                variants.append(f"{keywords} latest")
+        unique = []
+        for v in variants:
+            if normalize_query(v) not in {normalize_query(u) for u in unique}:
+                unique.append(v)
+        return unique[:max(1, self.fanout)]
+
+    async def search(self, query, max_results=3):
         """
-        Performs a web search using the official 'ddgs' library.
-        Fix: Passes query as a positional argument to avoid TypeError.
+        Returns formatted summary for Brain, ya None agar kuch nahi mila / search fail hui.
         """
+        print(f"[WebSearch]: Searching for '{query}'...")
         try:
-            print(f"[WebSearch]: Searching for '{query}'...")
-            
-            # Official 'ddgs' usage with Positional Argument
-            with DDGS() as ddgs:
-                # FIX: 'keywords' hata kar seedha 'query' pass kiya hai
-                # max_results abhi bhi keyword argument ki tarah kaam karega
-                results = list(ddgs.text(query, max_results=max_results))
-            
-            if not results:
-                print(f"[WebSearch Warning]: No results found for '{query}'.")
-                return None
-            
-            # Formatting for Brain
-            summary = "Web Search Results:\n"
-            for i, res in enumerate(results, 1):
-                # 'body' is the standard key in the new library
-                body = res.get('body', 'No description')
-                summary += f"{i}. {res['title']}: {body}\n"
-            
-            return summary
-            
+            results = await self.fetch(query, max_results)
         except Exception as e:
-            print(f"[Search Critical Error]: {e}")
+            print(f"[Search Error]: {e}")
+            return None
+        if not results:
+            print(f"[WebSearch Warning]: No results found for '{query}'.")
             return None
+        return self.format(results)
+
+    async def fetch(self, query, max_results=3):
+        key = (normalize_query(query), max_results)
+
+        cached = self.cache.get(key)
+        if cached and cached[0] > time.monotonic():
+            self.cache.move_to_end(key)
+            self.stats['hits'] += 1
+            return cached[1]
+
+        future = self.inflight.get(key)
+        if future:
+            self.stats['coalesced'] += 1
+            return await asyncio.shield(future)
+
+        self.stats['misses'] += 1
+        future = asyncio.get_running_loop().create_future()
+        self.inflight[key] = future
+        try:
+            results = await self.fan_out(query, max_results)
+            if results:
+                self.cache[key] = (time.monotonic() + self.ttl, results)
+                self.cache.move_to_end(key)
+                while len(self.cache) > self.max_entries:
+                    self.cache.popitem(last=False)
+            future.set_result(results)
+            return results
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters ke bina exception "never retrieved" warning na de
+            future.exception()
+            raise
+        finally:
+            del self.inflight[key]
+
+    async def fan_out(self, query, max_results):
+        variants = self.reformulations(query)
+        backend = self.get_backend()
+        batches = await asyncio.gather(*[
+            asyncio.wait_for(asyncio.to_thread(backend.text, v, max_results), timeout=self.timeout)
+            for v in variants
+        ], return_exceptions=True)
+
+        for variant, batch in zip(variants, batches):
+            if isinstance(batch, BaseException):
+                print(f"[Search Error]: '{variant}' failed ({batch!r})")
+        return self.merge([b for b in batches if not isinstance(b, BaseException)], max_results)
+
+    def merge(self, batches, max_results):
+        """
+        Original query ke results apne rank par pehle; bachi jagah reformulations
+        round-robin se bharo. URL/title se dedupe.
+        """
+        merged, seen = [], set()
+
+        def take(res):
+            keys = {res.get('href', '').rstrip('/').lower(), res.get('title', '').strip().lower()} - {''}
+            if keys & seen:
+                return False
+            seen.update(keys)
+            merged.append(res)
+            return len(merged) >= max_results
+
+        if not batches:
+            return merged
+        for res in batches[0]:
+            if take(res):
+                return merged
+        rest = batches[1:]
+        for rank in range(max((len(b) for b in rest), default=0)):
+            for batch in rest:
+                if rank < len(batch) and take(batch[rank]):
+                    return merged
+        return merged
+
+    def format(self, results):
+        # Formatting for Brain (snippet aur total budget ke andar)
+        summary = "Web Search Results:\n"
+        for i, res in enumerate(results, 1):
+            # 'body' is the standard key in the new library
+            body = truncate(res.get('body', 'No description'), self.snippet_chars)
+            line = f"{i}. {res.get('title', '')}: {body}\n"
+            if len(summary) + len(line) > self.total_chars:
+                break
+            summary += line
+        return summary
 
 # Global Instance
-web_searcher = WebSearch()
\ No newline at end of file
+web_searcher = WebSearch()
@@ -9,4 +9,5 @@ async def start_retina_guard(interval_mins=20):
         await bus.emit("VISION_BREAK", "Boss, look away! 20 seconds rest for your eyes.")
         
         # Simple popup (non-intrusive initially, can be upgraded to screen lock)
-        pyautogui.alert("Retina Guard: Look 20 feet away for 20 seconds. NOW.")
\ No newline at end of file
+        # Modal dialog hai - thread mein chalao taaki event loop (aur input worker) block na ho
+        await asyncio.to_thread(pyautogui.alert, "Retina Guard: Look 20 feet away for 20 seconds. NOW.")
\ No newline at end of file
@@ -1,3 +1,4 @@
+from core.subsystems import subsystems
 import socketio
 from aiohttp import web
 import asyncio
@@ -17,12 +18,18 @@ from modules.automation.system_control import start_system_control
 from modules.speak.mouth import mouth
 from modules.hear.ear import ear
 from modules.hear.wake_word import wake_listener 
-from modules.automation.launcher import launcher
-from modules.automation.atmosphere import atmosphere
-from modules.tools.web_search import web_searcher
-from modules.brain.router import router
 from modules.automation.actions import action_engine
-from modules.brain.reflex import reflex
+from modules.automation.scheduler import TaskScheduler
+from modules.automation.file_engine import file_engine
+from modules.brain.memory import memory, start_memory_compactor
+from modules.brain.llm_client import llm
+from modules.brain.intent_classifier import intent_classifier
+from modules.brain.model_manager import models, start_model_manager
+from modules.brain.orchestrator import TurnOrchestrator
+from modules.speak.mouth import pop_sentences
+from modules.speak.audio_output import PRIORITY_ALERT, PRIORITY_LOW
+
+subsystems.mark('imports')
 
 # Load Config
 with open("config/settings.yaml", "r", encoding="utf-8") as f:
@@ -34,6 +41,12 @@ app = web.Application()
 sio.attach(app)
 
 brain = SayraBrain()
+scheduler = TaskScheduler(
+    action_engine.execute,
+    max_workers=config.get('automation', {}).get('batch_workers', 3),
+    gui_settle=config.get('automation', {}).get('gui_settle', 0.3)
+)
+orchestrator = TurnOrchestrator(brain)
 shutdown_event = asyncio.Event()
 
 # --- HELPER: COMMAND PROCESSOR ---
@@ -101,18 +114,32 @@ async def process_command_logic(raw_text):
         await bus.emit("SYSTEM_SHUTDOWN")
         return
 
-    # 2. ROUTING (Dimaag lagao)
-    route = await router.determine_intent(text)
+    # Nayi command aayi hai -> purani chal rahi generations cancel karo
+    llm.cancel_inflight()
+
+    # 2. ROUTING (Dimaag lagao) - recall/warm-up/speculative chat saath-saath chalte hain
+    turn = await orchestrator.start(text)
+    route = turn.route
     print(f"[Router]: Route Selected -> {route['type']}")
 
+    try:
+        await execute_route(turn, route)
+    finally:
+        orchestrator.report(turn)
+
+async def execute_route(turn, route):
+    if route['type'] == 'CANCELLED':
+        return
+
     # 3. EXECUTION BRANCHES
     
     if route['type'] == 'REFLEX':
         # Identity Questions (Direct Answer)
         # Brain style karega is fact ko
         response = await brain.style_fact(route['response']['fact'])
-        await emit_to_ui('bot_message', response)
-        await mouth.speak(response)
+        if response:
+            await emit_to_ui('bot_message', response)
+            await mouth.speak(response)
 
     elif route['type'] == 'BATCH':
         # --- NEW: MULTI-TASK HANDLING ---
@@ -122,45 +149,75 @@ async def process_command_logic(raw_text):
         if len(tasks) > 1:
             await emit_to_ui('bot_message', f"Executing {len(tasks)} commands...")
         
-        for task in tasks:
-            intent = task['intent']
-            entities = task.get('entities', {})
-            
-            # UI Feedback per task
-            # await emit_to_ui('bot_message', f"👉 {intent}...") 
-            
-            # Execute Action
-            result_msg = await action_engine.execute(intent, entities)
-            
-            # Result Output
+        # Independent tasks parallel, conflicting (GUI/same folder) tasks order mein
+        async def report(index, task, result_msg):
             await emit_to_ui('bot_message', result_msg)
-            
-            # Optional: Speak only significant results or generic "Done"
-            # await mouth.speak(result_msg) 
-            
-            # Thoda delay taaki system hang na ho
-            await asyncio.sleep(1)
-            
-        await mouth.speak(f"All {len(tasks)} tasks completed Boss.")
+
+        await scheduler.run(tasks, on_result=report)
+
+        await mouth.speak(f"All {len(tasks)} tasks completed Boss.", priority=PRIORITY_LOW)
 
     else: # type == 'CHAT'
-        # Pure Conversation (Brain)
-        response = await brain.generate_response(text)
-        await emit_to_ui('bot_message', response)
-        await mouth.speak(response)
+        # Pure Conversation (Brain) - speculation ne shuru kar di ho to wahi tokens
+        if config['brain'].get('streaming', False):
+            await stream_chat_reply(orchestrator.reply_tokens(turn))
+            return
+
+        response = "".join([r async for r in orchestrator.reply_tokens(turn)])
+        if response:
+            await emit_to_ui('bot_message', response)
+            await mouth.speak(response)
+
+async def stream_chat_reply(tokens):
+    """
+    Tokens ko 'bot_message_delta' ke roop mein UI ko bhejta hai aur
+    har complete sentence ko turant speech queue mein daal deta hai.
+    """
+    speech_queue = asyncio.Queue()
+    speaker = asyncio.create_task(mouth.speak_queue(speech_queue))
+
+    full_text = ""
+    buffer = ""
+    async for token in tokens:
+        full_text += token
+        buffer += token
+        await emit_to_ui('bot_message_delta', token)
+
+        sentences, buffer = pop_sentences(buffer)
+        for sentence in sentences:
+            speech_queue.put_nowait(sentence)
+
+    if buffer.strip():
+        speech_queue.put_nowait(buffer.strip())
+    speech_queue.put_nowait(None)
+
+    if full_text.strip():
+        await emit_to_ui('bot_message', full_text.strip())
+    await speaker
 
 # --- BRIDGE ---
 async def emit_to_ui(event_name, data):
     await sio.emit(event_name, data)
 
+async def listen_with_partials():
+    """Ear ko thread mein chalao; bolte waqt ke partial transcripts UI tak bhejo."""
+    loop = asyncio.get_running_loop()
+
+    def on_partial(text):
+        # Ear ke worker thread se event loop par
+        asyncio.run_coroutine_threadsafe(emit_to_ui('user_transcription_partial', text), loop)
+
+    # Ear lazy hai: pehli baar thread ke andar hi load ho (loop block nahi)
+    return await loop.run_in_executor(None, lambda: ear.listen(on_partial))
+
 # --- HANDLERS ---
 async def handle_vision_break(message):
     await emit_to_ui('show_alert', {'type': 'warning', 'message': message})
-    await mouth.speak(message)
+    await mouth.speak(message, priority=PRIORITY_ALERT)
 
 async def handle_system_alert(message):
     await emit_to_ui('show_alert', {'type': 'info', 'message': message})
-    await mouth.speak(message)
+    await mouth.speak(message, priority=PRIORITY_ALERT)
 
 # Greeting Logic with Cooldown
 last_greet_time = 0
@@ -173,15 +230,28 @@ async def handle_user_returned(message):
     current_time = time.time()
     if (current_time - last_greet_time) > GREET_COOLDOWN:
         await emit_to_ui('bot_message', message)
-        await mouth.speak(message)
+        await mouth.speak(message, priority=PRIORITY_LOW)
         last_greet_time = current_time
 
 async def handle_user_away(data):
     await emit_to_ui('user_status', 'away')
 
+async def handle_file_progress(data):
+    await emit_to_ui('file_progress', data)
+
+async def handle_subsystem_status(data):
+    await emit_to_ui('subsystem_status', data)
+
 async def handle_shutdown(data):
     await emit_to_ui('system_status', 'shutting_down')
     await mouth.speak("Shutting down systems.")
+    # Pending memory writes disk par bhej do
+    # Memory kabhi load hi nahi hui to shutdown par Chroma load mat karo
+    if subsystems.ready('memory'):
+        await asyncio.to_thread(memory.flush)
+        print(f"[Memory]: Flushed before shutdown -> {memory.stats()}")
+    # Local model cold vs warm first-token latency (warm-up ka asar)
+    print(f"[Models]: First-token latency -> {models.stats()}")
     shutdown_event.set()
     # Force kill server after 2 seconds
     await asyncio.sleep(2)
@@ -192,7 +262,9 @@ bus.subscribe("VISION_BREAK", handle_vision_break)
 bus.subscribe("SYSTEM_ALERT", handle_system_alert)
 bus.subscribe("USER_RETURNED", handle_user_returned)
 bus.subscribe("USER_AWAY", handle_user_away)
+bus.subscribe("FILE_PROGRESS", handle_file_progress)
 bus.subscribe("SYSTEM_SHUTDOWN", handle_shutdown)
+bus.subscribe("SUBSYSTEM_STATUS", handle_subsystem_status)
 
 
 # --- SOCKET IO EVENTS ---
@@ -202,6 +274,9 @@ async def connect(sid, environ):
     await sio.emit('system_status', 'online', room=sid)
     # FIX: Initial message sent on connection
     await sio.emit('bot_message', "Sayra Online. Listening for 'Hey Sayra'...")
+    # Late-connect UI ko bhi pata chale kaunse subsystems ready hain
+    for status in subsystems.status.values():
+        await sio.emit('subsystem_status', status, room=sid)
 
 @sio.event
 async def user_command(sid, data):
@@ -214,14 +289,20 @@ async def user_command(sid, data):
         print(f"[Error]: {e}")
     await sio.emit('sayra_state', 'idle')
 
+@sio.event
+async def cancel_file_operation(sid):
+    count = file_engine.cancel_all()
+    await sio.emit('bot_message', "File operation cancelled." if count else "No file operation running.", room=sid)
+
 @sio.event
 async def voice_trigger(sid):
     # Manual Click Trigger Logic
     # Yahan bhi handshake use karenge to be safe
-    wake_listener.pause()
+    # (Porcupine abhi load na hua ho to proxy lookup thread mein)
+    await asyncio.to_thread(lambda: wake_listener.pause())
     await sio.emit('sayra_state', 'listening')
     
-    voice_text = await asyncio.get_event_loop().run_in_executor(None, ear.listen)
+    voice_text = await listen_with_partials()
     
     if voice_text:
         await sio.emit('user_transcription', voice_text)
@@ -229,7 +310,7 @@ async def voice_trigger(sid):
         await process_command_logic(voice_text)
     
     await sio.emit('sayra_state', 'idle')
-    wake_listener.resume()
+    await asyncio.to_thread(lambda: wake_listener.resume())
 
 # --- BACKGROUND TASKS ---
 async def monitor_vitals():
@@ -251,6 +332,20 @@ async def monitor_vitals():
 async def start_wake_word_detection():
     print("[SAYRA]: Wake Word Detection Started.")
     await asyncio.sleep(2)
+    # Mic handshake: pehle ear calibrate ho jaye, phir wake word stream khule
+    # (warm_all bhi isi order mein banata hai; dono ek saath mic na pakdein)
+    try:
+        await asyncio.to_thread(subsystems.get, 'ear')
+    except Exception as e:
+        print(f"[Startup Error]: ear: {e}")
+
+    # Porcupine + PyAudio (lazy) thread mein ready karo
+    try:
+        await asyncio.to_thread(subsystems.get, 'wake_word')
+    except Exception as e:
+        print(f"[WakeWord Error]: Wake word detection unavailable ({e})")
+        await bus.emit("SUBSYSTEM_STATUS", dict(subsystems.status['wake_word']))
+        return
     
     while True:
         # Loop mic read
@@ -271,7 +366,7 @@ async def start_wake_word_detection():
             except: pass
             
             # 3. Ear Listen (Ab Ear mic le sakta hai)
-            voice_text = await asyncio.get_event_loop().run_in_executor(None, ear.listen)
+            voice_text = await listen_with_partials()
             
             # 4. Process
             if voice_text:
@@ -290,6 +385,8 @@ async def start_wake_word_detection():
 async def start_background_tasks():
     vision_interval = config['protocols']['retina_guard']['interval_minutes']
     
+    # Heavy subsystems (Whisper, Chroma, Porcupine, pywhatkit) parallel threads mein
+    asyncio.create_task(subsystems.warm_all())
     asyncio.create_task(start_retina_guard(vision_interval))
     asyncio.create_task(start_circadian_fixer())
     asyncio.create_task(start_presence_monitor())
@@ -297,18 +394,36 @@ async def start_background_tasks():
     asyncio.create_task(start_feeder())
     asyncio.create_task(monitor_vitals())
     asyncio.create_task(start_wake_word_detection())
+    asyncio.create_task(brain.warm_reflex_styles())
+    asyncio.create_task(intent_classifier.warm())
+    asyncio.create_task(start_memory_compactor())
+    asyncio.create_task(start_model_manager())
     
     print("[SAYRA]: All Background Protocols Started.")
 
+async def run_server():
+    # Pehle port bind karo, phir heavy loading (UI turant connect ho sake)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, port=8080).start()
+    subsystems.mark('server_listening')
+    print("[SAYRA SERVER]: Listening on http://localhost:8080")
+
+    await start_background_tasks()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
 if __name__ == '__main__':
     print("[SAYRA SERVER]: Starting on http://localhost:8080")
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
-    loop.create_task(start_background_tasks())
     
     try:
-        web.run_app(app, port=8080, loop=loop)
+        loop.run_until_complete(run_server())
     except KeyboardInterrupt:
         print("Stopping...")
     finally:
-        wake_listener.cleanup()
\ No newline at end of file
+        if subsystems.ready('wake_word'):
+            wake_listener.cleanup()
\ No newline at end of file
@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import io from 'socket.io-client';
 import { Mic, LayoutDashboard } from 'lucide-react';
 import Dashboard from './components/Dashboard';
@@ -15,6 +15,7 @@ function App() {
   const [vitals, setVitals] = useState({ cpu: 0, ram: 0, battery: 0, power: '' });
   const [chatLogs, setChatLogs] = useState([]);
   const [showSpotlight, setShowSpotlight] = useState(false);
+  const streamingRef = useRef(false); // true while a reply is streaming in
 
   useEffect(() => {
     // Connection Handlers
@@ -27,17 +28,34 @@ function App() {
     });
     
     // Handle Messages & Logs
+    socket.on('bot_message_delta', (token) => {
+      setLastMessage(prev => (streamingRef.current ? prev + token : token));
+      streamingRef.current = true;
+    });
+
     socket.on('bot_message', (msg) => {
+      streamingRef.current = false;
       setLastMessage(msg);
       setMode('idle');
       addLog('bot', msg);
     });
 
+    // Live caption while Boss is still speaking
+    socket.on('user_transcription_partial', (text) => {
+      setLastMessage(text);
+    });
+
     socket.on('user_transcription', (text) => {
       addLog('user', text);
     });
 
     socket.on('sayra_state', (state) => setMode(state));
+
+    // Startup: heavy subsystems load in the background after connect
+    socket.on('subsystem_status', ({ name, state }) => {
+      if (state === 'loading') setLastMessage(`Loading ${name}...`);
+      if (state === 'failed') setLastMessage(`${name} failed to load.`);
+    });
     
     return () => socket.off();
   }, []);